@@ -3,7 +3,8 @@ Dependency injection functions for FastAPI routes
 """
 
 import os
-from typing import Annotated, Any, Optional
+from functools import lru_cache
+from typing import Annotated, Any
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
@@ -20,27 +21,19 @@ from app.utils.cache import CacheManager
 # Global singleton instances
 # ===========================
 
-# Single global browser manager
-_browser_manager = None
-
-# Global agent manager instance
-_agent_manager: Optional[AgentManager] = None
-
-# Global cache service instance
-_cache_service: Optional[ExtractorCacheService] = None
+# Browser, database, cache and agent services are memoized with lru_cache below
 
 
 # ===========================
 # Dependency injection functions
 # ===========================
 
+@lru_cache(maxsize=1)
 def get_browser_manager() -> BrowserManager:
     """Get the single browser manager instance"""
-    global _browser_manager
-    if _browser_manager is None:
-        _browser_manager = BrowserManager(get_settings())
-    return _browser_manager
+    return BrowserManager(get_settings())
 
+@lru_cache(maxsize=1)
 def get_database_manager() -> DatabaseManager:
     """Get database manager instance"""
     return DatabaseManager()
@@ -58,32 +51,32 @@ def get_substack_service(
     """Get Substack service instance"""
     return SubstackService(browser_manager, db_session)
 
-async def get_cache_service() -> ExtractorCacheService:
-    """Get cache service singleton with L1 (Redis) + L2 (DuckDB) tiering"""
-    global _cache_service
+@lru_cache(maxsize=1)
+def _cache_singleton() -> ExtractorCacheService:
+    """Build the shared cache service (one Redis pool, one DuckDB client)"""
+    settings = get_settings()
+    if not settings.redis_url:
+        settings = settings.model_copy(
+            update={"redis_url": os.getenv("REDIS_URL", "redis://redis-cache:6379")}
+        )
 
-    if _cache_service is None:
-        settings = get_settings()
-        if not settings.redis_url:
-            settings.redis_url = os.getenv("REDIS_URL", "redis://redis-cache:6379")
+    cache_manager = CacheManager(settings)
 
-        # Create manager
-        cache_manager = CacheManager(settings)
+    # Get DuckDB URL from environment
+    duckdb_url = os.getenv("DUCKDB_URL", "http://duckdb-cache:9001")
 
-        # Start cleanup task immediately (only runs once due to _cleanup_started flag)
-        await cache_manager.ensure_cleanup_running()
+    return ExtractorCacheService(cache_manager, duckdb_url=duckdb_url)
 
-        # Get DuckDB URL from environment
-        duckdb_url = os.getenv("DUCKDB_URL", "http://duckdb-cache:9001")
+async def get_cache_service() -> ExtractorCacheService:
+    """Get cache service singleton with L1 (Redis) + L2 (DuckDB) tiering"""
+    cache_service = _cache_singleton()
 
-        _cache_service = ExtractorCacheService(cache_manager, duckdb_url=duckdb_url)
+    # Start cleanup task on first use (only runs once due to _cleanup_started flag)
+    await cache_service.cache.ensure_cleanup_running()
 
-    return _cache_service
+    return cache_service
 
+@lru_cache(maxsize=1)
 def get_agent_manager() -> AgentManager:
     """Get or create agent manager singleton"""
-    global _agent_manager
-    if _agent_manager is None:
-        db_manager = get_database_manager()
-        _agent_manager = AgentManager(database_manager=db_manager)
-    return _agent_manager
+    return AgentManager(database_manager=get_database_manager())
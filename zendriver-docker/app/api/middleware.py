@@ -0,0 +1,117 @@
+"""
+ASGI middleware for the API
+"""
+
+from typing import Awaitable, Callable, Iterable, MutableMapping, Any
+from starlette.middleware.gzip import GZipMiddleware
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+
+class SingleOriginCORSMiddleware:
+    """
+    CORS for exactly one allowed origin (the control panel).
+
+    Behaves like Starlette's CORSMiddleware configured with a single origin,
+    credentials allowed and all methods/headers allowed, but compares the
+    raw origin bytes and appends precomputed header tuples instead of
+    building a Headers object per request.
+    """
+
+    def __init__(self, app: ASGIApp, allow_origin: str, max_age: int = 600):
+        self.app = app
+        self.allow_origin = allow_origin.encode("latin-1")
+
+        self.simple_headers = [
+            (b"access-control-allow-origin", self.allow_origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+        self.preflight_headers = self.simple_headers + [
+            (b"access-control-allow-methods", ALLOW_METHODS),
+            (b"access-control-max-age", str(max_age).encode("latin-1")),
+            (b"content-type", b"text/plain; charset=utf-8"),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(origin, request_headers, send)
+            return
+
+        if origin != self.allow_origin:
+            await self.app(scope, receive, send)
+            return
+
+        simple_headers = self.simple_headers
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + simple_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(self, origin: bytes, request_headers: bytes | None, send: Send) -> None:
+        """Answer a CORS preflight without touching the application"""
+        if origin == self.allow_origin:
+            status, body = 200, b"OK"
+            headers = list(self.preflight_headers)
+            if request_headers:
+                headers.append((b"access-control-allow-headers", request_headers))
+        else:
+            status, body = 400, b"Disallowed CORS origin"
+            headers = [(b"content-type", b"text/plain; charset=utf-8")]
+
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZip responses except on streaming (SSE) paths.
+
+    Compressing an event stream makes zlib buffer events until enough bytes
+    accumulate, which stalls the agent progress updates.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        compresslevel: int = 9,
+        exclude_paths: Iterable[str] = (),
+    ):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -2,12 +2,13 @@
 Agent chat and management routes
 """
 
-import json
+import asyncio
 from typing import Optional, List, Dict, Any
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import logging
+import orjson
 
 from app.services.agent_manager import AgentManager
 from app.api.dependencies import get_agent_manager, get_database_manager
@@ -17,6 +18,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Closing SSE frame, identical for every stream
+_SSE_DONE = b"data: " + orjson.dumps({"type": "done", "data": ""}) + b"\n\n"
+
 
 # ===========================
 # Request/Response Models
@@ -60,13 +64,13 @@ async def chat_endpoint(request: ChatRequest):
                 request.message,
                 request.history
             ):
-                yield f"data: {json.dumps(event)}\n\n"
+                yield b"data: " + orjson.dumps(event) + b"\n\n"
 
         except Exception as e:
             logger.error(f"Chat streaming error: {e}", exc_info=True)
-            yield f"data: {json.dumps({'type': 'error', 'data': str(e)})}\n\n"
+            yield b"data: " + orjson.dumps({"type": "error", "data": str(e)}) + b"\n\n"
 
-        yield f"data: {json.dumps({'type': 'done', 'data': ''})}\n\n"
+        yield _SSE_DONE
 
     return StreamingResponse(
         event_generator(),
@@ -97,6 +101,10 @@ async def get_last_result():
     Returns result only if it's less than 5 minutes old
     """
     try:
+        # Polling before any chat has run must not build the agent manager just to find nothing
+        if not get_agent_manager.cache_info().currsize:
+            return {"status": "success", "has_result": False}
+
         agent_manager = get_agent_manager()
         result = agent_manager.get_last_result(max_age_seconds=300)
 
@@ -133,7 +141,8 @@ async def get_execution_history(limit: int = 20, workflow_id: Optional[str] = No
         # Limit maximum to prevent large responses
         limit = min(limit, 100)
 
-        sessions = db_manager.get_research_sessions(
+        sessions = await asyncio.to_thread(
+            db_manager.get_research_sessions,
             workflow_id=workflow_id,
             limit=limit
         )
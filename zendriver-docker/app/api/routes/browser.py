@@ -7,7 +7,8 @@ from fastapi import APIRouter, HTTPException, Body, Depends, status
 import logging
 
 from app.core.browser import BrowserManager
-from app.core.exceptions import BrowserError, ElementNotFoundError
+from app.core.cloudflare import cf_is_interactive_challenge_present, cf_solve_slot, verify_cf
+from app.core.exceptions import BrowserError, ElementNotFoundError, SolverBusyError, error_response
 from app.core.timeouts import TIMEOUTS
 from app.models.requests import NavigationRequest, ClickRequest, OpenBackgroundTabRequest, CloseTabRequest
 from app.services.element import ElementService
@@ -70,13 +71,23 @@ async def _get_challenge_indicators(tab):
     """Cloudflare challenge detection logic"""
     return await safe_evaluate(tab, """
         (() => {
+            // innerText, not textContent: script/style source and hidden text
+            // would match the challenge phrases on ordinary pages. Lowercased once
+            const bodyText = (document.body?.innerText || '').toLowerCase();
+            const scripts = document.scripts || [];
+            let hasCfScript = false;
+            for (let i = 0; i < scripts.length; i++) {
+                if (scripts[i].src && scripts[i].src.includes('cloudflare')) {
+                    hasCfScript = true;
+                    break;
+                }
+            }
             const indicators = {
                 hasCfRay: !!document.querySelector('meta[name="cf-ray"]'),
                 hasChallengeForm: !!document.querySelector('form#challenge-form, form[action*="cdn-cgi"]'),
                 titleHasCloudflare: /cloudflare|checking|just a moment|checking your browser/i.test(document.title || ''),
-                hasCfScript: Array.from(document.scripts || []).some(s =>
-                    s.src && s.src.includes('cloudflare')),
-                bodyTextCloudflare: /checking your browser|just a moment|please wait|ddos protection by cloudflare|ray id/i.test(document.body?.innerText || '')
+                hasCfScript: hasCfScript,
+                bodyTextCloudflare: /checking your browser|just a moment|please wait|ddos protection by cloudflare|ray id/.test(bodyText)
             };
             return indicators;
         })()
@@ -106,20 +117,16 @@ async def detect_cloudflare(
     tab = await browser_manager.get_tab()
 
     try:
-        from app.utils.browser_utils import safe_evaluate
-
-        # Use challenge detection
         indicators = await _get_challenge_indicators(tab)
         challenge_type, is_cloudflare = await _determine_challenge_type(indicators)
 
-        # Additional check for Cloudflare interactive challenges
+        # Turnstile mounts in a closed shadow root that page script can't reach,
+        # so the interactive check stays on the CDP shadow-root scan
+        has_cf_interactive = False
         if is_cloudflare:
-            from app.core.cloudflare import cf_is_interactive_challenge_present
             has_cf_interactive = await cf_is_interactive_challenge_present(tab, timeout=TIMEOUTS.element_find)
             if has_cf_interactive:
                 challenge_type = "cloudflare_interactive"
-        else:
-            has_cf_interactive = False
 
         return {
             "status": "challenge_detected" if is_cloudflare else "no_challenge",
@@ -146,16 +153,14 @@ async def solve_cloudflare_challenge(
     tab = await browser_manager.get_tab()
 
     try:
-        from app.utils.browser_utils import safe_evaluate
-
         # Use challenge detection
         indicators = await _get_challenge_indicators(tab)
         challenge_type, is_cloudflare_page = await _determine_challenge_type(indicators)
 
         # Solve Cloudflare challenge
         if is_cloudflare_page:
-            from app.core.cloudflare import verify_cf
-            await verify_cf(tab, click_delay=click_delay, timeout=timeout)
+            async with cf_solve_slot():
+                await verify_cf(tab, click_delay=click_delay, timeout=timeout)
             return {
                 "status": "success",
                 "message": "Cloudflare challenge solved",
@@ -168,6 +173,8 @@ async def solve_cloudflare_challenge(
             "message": "No Cloudflare challenge found"
         }
 
+    except SolverBusyError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     except TimeoutError as e:
         return {
             "status": "timeout",
@@ -175,10 +182,7 @@ async def solve_cloudflare_challenge(
         }
     except Exception as e:
         logger.error(f"Cloudflare solve error: {e}")
-        return {
-            "status": "error",
-            "error": str(e)
-        }
+        return error_response(e)
 
 
 # ===========================
@@ -206,6 +210,15 @@ async def load_cookies(
     return {"status": "loaded", "file": file}
 
 
+@router.post("/admin/save_now")
+async def save_session_now(
+    browser_manager: Annotated[BrowserManager, Depends(get_browser_manager)]
+):
+    """Wake the periodic session saver to persist session data immediately"""
+    browser_manager.request_session_save()
+    return {"status": "scheduled", "message": "Session save requested"}
+
+
 # ===========================
 # Tab Management
 # ===========================
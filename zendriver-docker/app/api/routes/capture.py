@@ -2,11 +2,14 @@
 Page capture and screenshot routes
 """
 
+import asyncio
 import os
 import re
 from typing import Annotated, Optional
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Body, Depends
+import aiofiles
+import aiofiles.os
 import logging
 
 from app.core.config import Settings, get_settings
@@ -15,12 +18,15 @@ from app.core.exceptions import ElementNotFoundError
 from app.core.timeouts import TIMEOUTS
 from app.api.dependencies import get_browser_manager
 from app.services.extraction import UnifiedExtractionService
-from app.utils.browser_utils import safe_evaluate
+from app.utils.browser_utils import batched_evaluate, safe_evaluate
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Characters stripped from page titles when building export filenames
+_SAFE_TITLE_RE = re.compile(r'[^\w\s-]')
+
 
 # ===========================
 # Export Operations
@@ -38,14 +44,15 @@ async def capture_page_as_markdown(
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    # Get page URL and title
-    current_url = await safe_evaluate(tab, "window.location.href")
-    page_title = await safe_evaluate(tab, "document.title")
+    # Get page URL and title (coalesced into one evaluate)
+    current_url, page_title = await asyncio.gather(
+        batched_evaluate(tab, "window.location.href"),
+        batched_evaluate(tab, "document.title")
+    )
 
     # Extract content
     if use_trafilatura:
         # Use Trafilatura for high-quality extraction
-        from app.services.extraction import UnifiedExtractionService
         extraction_service = UnifiedExtractionService(browser_manager, None)
         result = await extraction_service.extract_with_trafilatura(tab)
 
@@ -61,40 +68,44 @@ async def capture_page_as_markdown(
         content = await safe_evaluate(tab, "document.body.innerText")
         metadata = {"title": page_title, "url": current_url}
 
-    # Build markdown
-    md_content = f"# {metadata.get('title', 'Untitled')}\n\n"
-
-    if include_metadata:
-        md_content += f"**URL:** {metadata.get('url', current_url)}\n"
-        md_content += f"**Exported:** {datetime.now().isoformat()}\n"
-        if metadata.get('author'):
-            md_content += f"**Author:** {metadata['author']}\n"
-        if metadata.get('date'):
-            md_content += f"**Date:** {metadata['date']}\n"
-        if metadata.get('description'):
-            md_content += f"**Description:** {metadata['description']}\n"
-        md_content += "\n---\n\n"
-
-    # Add main content
-    md_content += content if content else "No content extracted"
-
     # Save file to tmp directory (same pattern as screenshots)
     exports_dir = '/tmp/exports'
-    os.makedirs(exports_dir, exist_ok=True)
+    await aiofiles.os.makedirs(exports_dir, exist_ok=True)
 
     # Clean filename from title
-    safe_title = re.sub(r'[^\w\s-]', '', page_title or 'page')[:50]
+    safe_title = _SAFE_TITLE_RE.sub('', page_title or 'page')[:50]
     filename = f"{timestamp}_{safe_title}.md"
     filepath = os.path.join(exports_dir, filename)
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(md_content)
+    # Build the short header; the (possibly large) content is written separately
+    header = [f"# {metadata.get('title', 'Untitled')}\n\n"]
+
+    if include_metadata:
+        header.append(f"**URL:** {metadata.get('url', current_url)}\n")
+        header.append(f"**Exported:** {datetime.now().isoformat()}\n")
+        if metadata.get('author'):
+            header.append(f"**Author:** {metadata['author']}\n")
+        if metadata.get('date'):
+            header.append(f"**Date:** {metadata['date']}\n")
+        if metadata.get('description'):
+            header.append(f"**Description:** {metadata['description']}\n")
+        header.append("\n---\n\n")
+
+    # File I/O runs off the event loop
+    async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
+        await f.write("".join(header))
+        # Add main content
+        await f.write(content if content else "No content extracted")
+
+        # Size from the open descriptor: no re-encode, no second path lookup
+        await f.flush()
+        size_bytes = os.fstat(f.fileno()).st_size
 
     return {
         "status": "success",
         "filename": filename,
         "path": filepath,
-        "size_bytes": len(md_content.encode('utf-8')),
+        "size_bytes": size_bytes,
         "url": current_url,
         "title": page_title
     }
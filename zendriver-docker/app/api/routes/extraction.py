@@ -2,15 +2,16 @@
 Content extraction and cache analytics routes
 """
 
-from typing import Annotated, Optional, List
+import re
+from typing import Annotated, List
 from datetime import datetime
 from urllib.parse import urlparse
 from fastapi import APIRouter, Query, Body, Depends
-from pydantic import BaseModel, Field
 import logging
 
 from app.core.browser import BrowserManager
-from app.models.requests import ExtractionRequestComplete
+from app.core.exceptions import error_response
+from app.models.requests import ExtractionRequest
 from app.services.cache_service import ExtractorCacheService
 from app.services.extraction import UnifiedExtractionService
 from app.api.dependencies import get_browser_manager, get_cache_service
@@ -19,18 +20,12 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-
-# ===========================
-# Request Models
-# ===========================
-
-class ExtractionRequest(BaseModel):
-    """Enhanced extraction request"""
-    selector: Optional[str] = Field(None, description="CSS selector")
-    extract_text: Optional[bool] = Field(True, description="Extract text content")
-    extract_href: Optional[bool] = Field(False, description="Extract href attributes")
-    extract_all: Optional[bool] = Field(False, description="Extract from all matching elements")
-    extract_attributes: Optional[List[str]] = Field(None, description="List of attributes to extract")
+# Cache key classification for analytics, checked in priority order
+CACHE_KEY_BUCKETS = (
+    ("search", re.compile(r"search")),
+    ("dynamic", re.compile(r"price|stock|live")),
+    ("structural", re.compile(r"nav|header|footer")),
+)
 
 
 # ===========================
@@ -47,24 +42,21 @@ async def get_cache_analytics(
             "memory_cache_size": len(cache_service.cache.memory_cache),
             "cache_enabled": cache_service.cache.settings.redis_url is not None,
             "redis_connected": cache_service.cache.redis_client is not None,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
 
         # Get sample of cached keys for analysis
         sample_keys = list(cache_service.cache.memory_cache.keys())[:20]
         stats["sample_cached_items"] = len(sample_keys)
 
-        # Analyze cache key patterns
+        # Analyze cache key patterns (first matching bucket wins)
         bypass_patterns = {"search": 0, "dynamic": 0, "structural": 0, "other": 0}
         for key in sample_keys:
-            if "search" in key:
-                bypass_patterns["search"] += 1
-            elif any(pattern in key for pattern in ["price", "stock", "live"]):
-                bypass_patterns["dynamic"] += 1
-            elif any(pattern in key for pattern in ["nav", "header", "footer"]):
-                bypass_patterns["structural"] += 1
-            else:
-                bypass_patterns["other"] += 1
+            bucket = next(
+                (name for name, pattern in CACHE_KEY_BUCKETS if pattern.search(key)),
+                "other"
+            )
+            bypass_patterns[bucket] += 1
 
         stats["cache_patterns"] = bypass_patterns
 
@@ -79,11 +71,7 @@ async def get_cache_analytics(
         return stats
 
     except Exception as e:
-        return {
-            "status": "error",
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }
+        return error_response(e)
 
 @router.get("/optimization/suggest_selectors")
 async def suggest_optimized_selectors(
@@ -96,7 +84,6 @@ async def suggest_optimized_selectors(
         optimized_selector = await cache_service.get_optimized_selector(url, element_type)
 
         # Get performance stats for the domain
-        from urllib.parse import urlparse
         domain = urlparse(url).netloc
         best_selectors = await cache_service.get_best_selectors(domain) if domain else []
 
@@ -107,15 +94,11 @@ async def suggest_optimized_selectors(
             "optimized_selector": optimized_selector,
             "available_selectors_count": len(best_selectors),
             "domain_has_data": len(best_selectors) > 0,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
 
     except Exception as e:
-        return {
-            "status": "error",
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }
+        return error_response(e)
 
 
 # ===========================
@@ -137,7 +120,7 @@ async def parallel_extraction(
 async def extract_content(
     browser_manager: Annotated[BrowserManager, Depends(get_browser_manager)],
     cache_service: Annotated[ExtractorCacheService, Depends(get_cache_service)],
-    request: ExtractionRequestComplete
+    request: ExtractionRequest
 ):
     """Universal extraction with caching support"""
     service = UnifiedExtractionService(browser_manager, cache_service)
@@ -149,7 +132,7 @@ async def extract_content(
         extract_all=request.extract_all,
         extract_text=request.extract_text,
         extract_href=request.extract_href,
-        use_cache=request.use_cache,
+        use_cache=request.use_cache and not request.force_refresh,
         include_metadata=request.include_metadata,
         format_style=request.format_style
     )
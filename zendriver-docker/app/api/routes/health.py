@@ -2,15 +2,18 @@
 Health check and info routes
 """
 
+import asyncio
 from typing import Annotated
 from datetime import datetime
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+import orjson
 
 from app.core.config import Settings, get_settings
-from app.core.browser import BrowserManager
+from app.core.browser import BrowserManager, is_browser_alive
 from app.core.database import DatabaseManager
+from app.core.exceptions import error_response
 from app.services.cache_service import ExtractorCacheService
-from app.api.dependencies import get_browser_manager, get_database_manager, get_cache_service
+from app.api.dependencies import get_browser_manager, get_cache_service
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,31 +21,24 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.get("/")
-async def root():
-    """API information"""
-    settings = get_settings()
-    return {
-        "service": settings.app_name,
-        "version": "4.0.0",
-        "status": "ready",
-        "features": [
-            "navigation", "clicking", "typing", "scrolling",
-            "element_discovery", "tab_navigation", "extraction", "keyboard",
-            "browser_warmup"
-        ],
-        "warmup_status": "enabled"
-    }
+# ===========================
+# Health Snapshot
+# ===========================
 
-@router.get("/health")
-async def health_check(
-    browser_manager: Annotated[BrowserManager, Depends(get_browser_manager)],
-    db_manager: Annotated[DatabaseManager, Depends(get_database_manager)]
-):
-    """Health check endpoint"""
+HEALTH_REFRESH_INTERVAL = 5  # seconds
+
+# Pre-serialized body, swapped wholesale by the updater so readers never see a partial write
+_health_body: bytes = orjson.dumps({
+    "status": "healthy",
+    "browser_running": False,
+    "database_healthy": False,
+    "timestamp": None
+})
+
+async def _probe_health(browser_manager: BrowserManager, db_manager: DatabaseManager) -> dict:
+    """Run the browser and database liveness probes"""
     browser_status = False
     try:
-        from app.core.browser import is_browser_alive
         browser = await browser_manager.get_browser()
         browser_status = await is_browser_alive(browser)
     except Exception:
@@ -50,7 +46,7 @@ async def health_check(
 
     db_healthy = False
     try:
-        sessions = db_manager.get_research_sessions(limit=1)
+        await asyncio.to_thread(db_manager.get_research_sessions, limit=1)
         db_healthy = True
     except Exception:
         pass
@@ -59,9 +55,48 @@ async def health_check(
         "status": "healthy",
         "browser_running": browser_status,
         "database_healthy": db_healthy,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now()
+    }
+
+async def health_snapshot_updater(
+    browser_manager: BrowserManager,
+    db_manager: DatabaseManager,
+    stop_event: asyncio.Event
+):
+    """Refresh the /health snapshot every HEALTH_REFRESH_INTERVAL seconds until stopped"""
+    global _health_body
+    while not stop_event.is_set():
+        try:
+            _health_body = orjson.dumps(await _probe_health(browser_manager, db_manager))
+        except Exception as e:
+            logger.error(f"Health snapshot refresh failed: {e}")
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=HEALTH_REFRESH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+@router.get("/")
+async def root():
+    """API information"""
+    settings = get_settings()
+    return {
+        "service": settings.app_name,
+        "version": "4.0.0",
+        "status": "ready",
+        "features": [
+            "navigation", "clicking", "typing", "scrolling",
+            "element_discovery", "tab_navigation", "extraction", "keyboard",
+            "browser_warmup"
+        ],
+        "warmup_status": "enabled"
     }
 
+@router.get("/health")
+async def health_check():
+    """Health check endpoint (served from the background-refreshed snapshot)"""
+    return Response(content=_health_body, media_type="application/json")
+
 @router.get("/get_current_url")
 async def get_current_url(
     browser_manager: Annotated[BrowserManager, Depends(get_browser_manager)]
@@ -69,8 +104,8 @@ async def get_current_url(
     """Get current URL from persistent browser"""
     try:
         tab = await browser_manager.get_tab()
-        url = await tab.evaluate("window.location.href")
-        title = await tab.evaluate("document.title")
+        result = await tab.evaluate("[window.location.href, document.title]")
+        url, title = result if isinstance(result, list) else (None, None)
 
         return {
             "status": "success",
@@ -79,11 +114,7 @@ async def get_current_url(
         }
     except Exception as e:
         logger.error(f"Error getting URL: {e}")
-        return {
-            "status": "error",
-            "url": "unknown",
-            "error": str(e)
-        }
+        return error_response(e, url="unknown")
 
 @router.get("/cache/stats")
 async def get_cache_stats(
@@ -101,13 +132,9 @@ async def get_cache_stats(
         stats = await cache_service.get_comprehensive_stats()
         return {
             "status": "success",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
             "cache_stats": stats
         }
     except Exception as e:
         logger.error(f"Error getting cache stats: {e}")
-        return {
-            "status": "error",
-            "error": str(e),
-            "timestamp": datetime.now().isoformat()
-        }
+        return error_response(e)
@@ -3,9 +3,11 @@ User interaction routes (typing, scrolling, keyboard, elements)
 """
 
 import asyncio
-from typing import Annotated, Optional, Dict
+import json
+import random
+from typing import Annotated, Literal, Optional, Dict
 from fastapi import APIRouter, HTTPException, Body, Depends
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from zendriver import cdp
 from zendriver.cdp import input_ as cdp_input
 from zendriver.core.keys import KeyEvents, SpecialKeys, KeyPressEvent
@@ -21,42 +23,140 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Typing is sent in bursts of at most this many characters
+TYPING_CHUNK_SIZE = 8
+
+# Characters after which a typing burst ends (natural pause points)
+TYPING_BREAK_CHARS = frozenset('.!?,;: ')
+
+# Upper bound on the post-Enter wait, and the quiet period that counts as network idle
+POST_ENTER_TIMEOUT = 3.0  # seconds
+POST_ENTER_IDLE_WINDOW = 0.3  # seconds
+
+# How long a CSS select may wait before the text-find fallback takes over
+SELECT_FIRST_TIMEOUT = 1.0  # seconds
+
+# Extra pause range (seconds) after characters where a typist hesitates
+_KEYSTROKE_PAUSES = {
+    **dict.fromkeys('.!?,;:', (0.02, 0.05)),  # Shorter pauses after punctuation for speed
+    ' ': (0.005, 0.015),  # Extra short pause for spaces (natural word boundaries)
+}
+
+
+def _keystroke_delays(text: str, base_delay: float) -> list[float]:
+    """Per-character typing delays (tight variance plus boundary pauses), drawn up front"""
+    uniform = random.uniform
+    # Add tighter variance for faster but still natural feel
+    delays = [base_delay + uniform(-0.015, 0.02) for _ in text]
+    for i, char in enumerate(text):
+        pause = _KEYSTROKE_PAUSES.get(char)
+        if pause:
+            delays[i] += uniform(*pause)
+    return delays
+
 
 # ===========================
 # Request Models
 # ===========================
 
-class TypeRequest(BaseModel):
+class _RequestModel(BaseModel):
+    """Frozen request body where an explicit null falls back to the field default"""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
+    # Clients sent null for optional flags when these fields were Optional[...]
+    @field_validator('*', mode='before')
+    @classmethod
+    def _null_to_default(cls, v, info):
+        if v is None:
+            field = cls.model_fields[info.field_name]
+            if not field.is_required():
+                return field.get_default(call_default_factory=True)
+        return v
+
+class TypeRequest(_RequestModel):
     """Request model for typing text"""
     text: str = Field(..., description="Text to type")
     selector: Optional[str] = Field(None, description="CSS selector of input element")
-    clear_first: Optional[bool] = Field(False, description="Clear field before typing")
-    press_enter: Optional[bool] = Field(False, description="Press Enter after typing")
-    delay: Optional[float] = Field(0.045, description="Delay between keystrokes (130 WPM - Speedy Gonzales)")
-
-class ScrollRequest(BaseModel):
+    clear_first: bool = Field(False, description="Clear field before typing")
+    press_enter: bool = Field(False, description="Press Enter after typing")
+    delay: float = Field(0.045, description="Delay between keystrokes (130 WPM - Speedy Gonzales)")
+    wait_for: Literal["network_idle", "navigation", "none"] = Field(
+        "network_idle", description="What to wait for after press_enter (capped at 3s)"
+    )
+
+class ScrollRequest(_RequestModel):
     """Request model for scrolling"""
-    direction: Optional[str] = Field("down", description="Direction: up, down, left, right")
-    pixels: Optional[int] = Field(300, description="Pixels to scroll")
+    direction: str = Field("down", description="Direction: up, down, left, right")
+    pixels: int = Field(300, description="Pixels to scroll")
     to_element: Optional[str] = Field(None, description="CSS selector to scroll to")
-    smooth: Optional[bool] = Field(True, description="Use smooth scrolling")
+    smooth: bool = Field(True, description="Use smooth scrolling")
 
-class ElementSearchRequest(BaseModel):
+class ElementSearchRequest(_RequestModel):
     """Request model for finding elements"""
-    element_type: Optional[str] = Field("all", description="Type: input, button, link, text, all")
-    interactive_only: Optional[bool] = Field(True, description="Only return interactive elements")
-    visible_only: Optional[bool] = Field(True, description="Only return visible elements")
+    element_type: str = Field("all", description="Type: input, button, link, text, all")
+    interactive_only: bool = Field(True, description="Only return interactive elements")
+    visible_only: bool = Field(True, description="Only return visible elements")
 
-class TabNavigationRequest(BaseModel):
+class TabNavigationRequest(_RequestModel):
     """Request model for tab navigation"""
-    count: Optional[int] = Field(1, description="Number of times to press tab")
-    shift: Optional[bool] = Field(False, description="Hold shift (go backwards)")
+    count: int = Field(1, description="Number of times to press tab")
+    shift: bool = Field(False, description="Hold shift (go backwards)")
 
 
 # ===========================
 # Type/Input and Keyboard Functionality
 # ===========================
 
+async def _select_or_find(tab, query: str, timeout: float):
+    """CSS select with a text-find fallback; the exact select match always wins"""
+    # Run one after the other: both fetch DOM.getDocument, and overlapping calls
+    # invalidate each other's nodeIds. A short select keeps a miss cheap
+    try:
+        element = await tab.select(query, timeout=min(timeout, SELECT_FIRST_TIMEOUT))
+    except Exception:
+        element = None  # Timeout or invalid CSS; fall back to the text match
+    if element:
+        return element
+
+    try:
+        return await tab.find(query, timeout=timeout)
+    except Exception:
+        return None
+
+async def _press_enter_and_wait(tab, element, wait_for: str, timeout: float = POST_ENTER_TIMEOUT):
+    """Press Enter, then wait for the page to react instead of sleeping a fixed time"""
+    if wait_for == "none":
+        await element.send_keys("\n")
+        return
+
+    # Register before pressing Enter so no event is missed
+    event_type = cdp.page.LoadEventFired if wait_for == "navigation" else cdp.network.RequestWillBeSent
+    activity = asyncio.Event()
+
+    def on_activity(event):
+        activity.set()
+
+    tab.add_handler(event_type, on_activity)
+    try:
+        await element.send_keys("\n")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        if wait_for == "navigation":
+            await asyncio.wait_for(activity.wait(), timeout=timeout)
+        else:
+            # Network idle: no new request for POST_ENTER_IDLE_WINDOW
+            while (remaining := deadline - loop.time()) > 0:
+                await asyncio.wait_for(activity.wait(), timeout=min(POST_ENTER_IDLE_WINDOW, remaining))
+                activity.clear()
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        try:
+            tab.remove_handler(event_type, on_activity)
+        except Exception as e:
+            logger.warning(f"Failed to remove post-Enter handler: {e}")
+
 @router.post("/interaction/type")
 async def type_text(
     request: TypeRequest,
@@ -68,12 +168,9 @@ async def type_text(
     try:
         element = None
 
-        # Find element by selector
+        # Find element by selector, or by text if the selector looks like text
         if request.selector:
-            element = await tab.select(request.selector, timeout=TIMEOUTS.element_find)
-            if not element:
-                # Try finding by text if selector looks like text
-                element = await tab.find(request.selector, timeout=TIMEOUTS.element_find)
+            element = await _select_or_find(tab, request.selector, TIMEOUTS.element_find)
 
         if not element:
             raise ElementNotFoundError(f"Could not find element: {request.selector}")
@@ -84,23 +181,19 @@ async def type_text(
 
         # Type the text with fast but natural timing (Speedy Gonzales style)
         if request.delay and request.delay > 0:
-            import random
-            # Character-by-character typing with human-like variance
-            for char in request.text:
-                base_delay = request.delay
-                # Add tighter variance for faster but still natural feel
-                actual_delay = base_delay + random.uniform(-0.015, 0.02)
-
-                # Shorter pauses after punctuation for speed
-                if char in '.!?,;:':
-                    actual_delay += random.uniform(0.02, 0.05)
-
-                # Extra short pause for spaces (natural word boundaries)
-                if char == ' ':
-                    actual_delay += random.uniform(0.005, 0.015)
-
-                await element.send_keys(char)
-                await asyncio.sleep(actual_delay)
+            # Short bursts with human-like variance: one send_keys and one sleep per burst
+            delays = _keystroke_delays(request.text, request.delay)
+            chunk, chunk_delay = [], 0.0
+            last_index = len(request.text) - 1
+            for i, (char, delay) in enumerate(zip(request.text, delays)):
+                chunk.append(char)
+                chunk_delay += delay
+
+                # Flush at word/punctuation boundaries or when the burst is full
+                if char in TYPING_BREAK_CHARS or len(chunk) >= TYPING_CHUNK_SIZE or i == last_index:
+                    await element.send_keys("".join(chunk))
+                    await asyncio.sleep(chunk_delay)
+                    chunk, chunk_delay = [], 0.0
         else:
             # Send all at once if no delay specified
             await element.send_keys(request.text)
@@ -108,8 +201,7 @@ async def type_text(
         # Press Enter if requested
         if request.press_enter:
             await asyncio.sleep(0.3)  # Small delay before Enter
-            await element.send_keys("\n")
-            await asyncio.sleep(3)  # Wait for action to complete
+            await _press_enter_and_wait(tab, element, request.wait_for)
 
         return {
             "status": "success",
@@ -120,6 +212,28 @@ async def type_text(
         logger.error(f"Type text error: {e}")
         return {"status": "error", "error": str(e)}
 
+# Map common key names to SpecialKeys
+SPECIAL_KEYS = {
+    "enter": SpecialKeys.ENTER,
+    "return": SpecialKeys.ENTER,
+    "tab": SpecialKeys.TAB,
+    "escape": SpecialKeys.ESCAPE,
+    "esc": SpecialKeys.ESCAPE,
+    "backspace": SpecialKeys.BACKSPACE,
+    "delete": SpecialKeys.DELETE,
+    "space": SpecialKeys.SPACE,
+    "arrowup": SpecialKeys.ARROW_UP,
+    "arrowdown": SpecialKeys.ARROW_DOWN,
+    "arrowleft": SpecialKeys.ARROW_LEFT,
+    "arrowright": SpecialKeys.ARROW_RIGHT,
+}
+
+# CDP keyDown/keyUp payloads per special key; constant, so built once at import
+SPECIAL_KEY_PAYLOADS = {
+    name: KeyEvents(special_key).to_cdp_events(KeyPressEvent.DOWN_AND_UP)
+    for name, special_key in SPECIAL_KEYS.items()
+}
+
 @router.post("/interaction/keyboard")
 async def keyboard_action(
     browser_manager: Annotated[BrowserManager, Depends(get_browser_manager)],
@@ -131,38 +245,14 @@ async def keyboard_action(
     tab = await browser_manager.get_tab()
 
     try:
-        # Map common key names to SpecialKeys
-        special_key_map = {
-            "enter": SpecialKeys.ENTER,
-            "return": SpecialKeys.ENTER,
-            "tab": SpecialKeys.TAB,
-            "escape": SpecialKeys.ESCAPE,
-            "esc": SpecialKeys.ESCAPE,
-            "backspace": SpecialKeys.BACKSPACE,
-            "delete": SpecialKeys.DELETE,
-            "space": SpecialKeys.SPACE,
-            "arrowup": SpecialKeys.ARROW_UP,
-            "arrowdown": SpecialKeys.ARROW_DOWN,
-            "arrowleft": SpecialKeys.ARROW_LEFT,
-            "arrowright": SpecialKeys.ARROW_RIGHT,
-        }
-
-        key_lower = key.lower()
-
-        # Check if it's a special key
-        if key_lower in special_key_map:
-            special_key = special_key_map[key_lower]
-            key_event = KeyEvents(special_key)
-            payloads = key_event.to_cdp_events(KeyPressEvent.DOWN_AND_UP)
-
-            # Send the CDP events directly to the tab
-            for payload in payloads:
-                await tab.send(cdp.input_.dispatch_key_event(**payload))
-        else:
-            # For regular characters, use KeyEvents.from_text
+        # Special keys use their precomputed down/up events; anything else is typed as text
+        payloads = SPECIAL_KEY_PAYLOADS.get(key.lower())
+        if payloads is None:
             payloads = KeyEvents.from_text(key, KeyPressEvent.CHAR)
-            for payload in payloads:
-                await tab.send(cdp.input_.dispatch_key_event(**payload))
+
+        # Send the CDP events directly to the tab
+        for payload in payloads:
+            await tab.send(cdp.input_.dispatch_key_event(**payload))
 
         # Small delay to let the action complete
         await asyncio.sleep(0.1)
@@ -181,6 +271,42 @@ async def keyboard_action(
 # Scroll Functionality
 # ===========================
 
+# Scroll snippets are fixed function sources; per-request values are passed as
+# JSON-encoded arguments so the script body never changes between calls
+
+# Resolves only once the scroll position has held still for two frames
+# (capped at 1.5s), so callers can interact with the element immediately
+_SCROLL_TO_ELEMENT_JS = """
+    (selector, behavior) => {
+        const element = document.querySelector(selector);
+        if (!element) return false;
+        element.scrollIntoView({behavior, block: 'center'});
+        return new Promise(resolve => {
+            let lastX = window.scrollX, lastY = window.scrollY, still = 0;
+            const tick = () => {
+                const x = window.scrollX, y = window.scrollY;
+                still = (x === lastX && y === lastY) ? still + 1 : 0;
+                lastX = x; lastY = y;
+                if (still >= 2) resolve(true); else requestAnimationFrame(tick);
+            };
+            requestAnimationFrame(tick);
+            setTimeout(() => resolve(true), 1500);
+        });
+    }
+"""
+
+_SCROLL_BY_JS = """
+    (left, top, behavior) => {
+        window.scrollBy({left, top, behavior});
+        return {x: window.pageXOffset, y: window.pageYOffset};
+    }
+"""
+
+
+def _js_call(function_js: str, *args) -> str:
+    """Build an expression invoking a JS function source with JSON-encoded arguments"""
+    return f"({function_js})({', '.join(json.dumps(arg) for arg in args)})"
+
 @router.post("/interaction/scroll")
 async def scroll_page(
     browser_manager: Annotated[BrowserManager, Depends(get_browser_manager)],
@@ -189,20 +315,15 @@ async def scroll_page(
     """Scroll the page"""
     tab = await browser_manager.get_tab()
     try:
+        behavior = 'smooth' if request.smooth else 'auto'
+
         if request.to_element:
             # Scroll to specific element
-            script = f"""
-                const element = document.querySelector('{request.to_element}');
-                if (element) {{
-                    element.scrollIntoView({{
-                        behavior: '{'smooth' if request.smooth else 'auto'}',
-                        block: 'center'
-                    }});
-                    return true;
-                }}
-                return false;
-            """
-            success = await safe_evaluate(tab, script)
+            success = await safe_evaluate(
+                tab,
+                _js_call(_SCROLL_TO_ELEMENT_JS, request.to_element, behavior),
+                await_promise=True
+            )
             if not success:
                 raise ElementNotFoundError(f"Element not found: {request.to_element}")
         else:
@@ -217,18 +338,7 @@ async def scroll_page(
             elif request.direction == "left":
                 x = -request.pixels
 
-            script = f"""
-                window.scrollBy({{
-                    left: {x},
-                    top: {y},
-                    behavior: '{'smooth' if request.smooth else 'auto'}'
-                }});
-                return {{
-                    x: window.pageXOffset,
-                    y: window.pageYOffset
-                }};
-            """
-            position = await safe_evaluate(tab, script)
+            position = await safe_evaluate(tab, _js_call(_SCROLL_BY_JS, x, y, behavior))
 
             return {
                 "status": "success",
@@ -256,6 +366,33 @@ async def scroll_page(
 # Element Discovery
 # ===========================
 
+# CSS selector used for each find_elements element_type
+ELEMENT_TYPE_SELECTORS = {
+    "input": "input, textarea, select",
+    "button": "button, input[type='submit'], input[type='button'], [role='button']",
+    "link": "a[href]",
+    "text": "p, span, div, h1, h2, h3, h4, h5, h6",
+    "all": "*"
+}
+
+def _describe_element(elem, position) -> dict:
+    """Summarize an element for find_elements, reading text and attrs once each"""
+    text = elem.text
+    attrs = elem.attrs
+    return {
+        "tagName": elem.tag_name,
+        "text": text[:100] if text else None,
+        "id": attrs.get("id"),
+        "className": attrs.get("class"),
+        "href": attrs.get("href"),
+        "position": {
+            "x": position.left,
+            "y": position.top,
+            "width": position.width,
+            "height": position.height
+        }
+    }
+
 @router.post("/interaction/find_elements")
 async def find_elements(
     browser_manager: Annotated[BrowserManager, Depends(get_browser_manager)],
@@ -264,37 +401,22 @@ async def find_elements(
     """Find elements using native Zendriver methods"""
     tab = await browser_manager.get_tab()
 
-    selectors = {
-        "input": "input, textarea, select",
-        "button": "button, input[type='submit'], input[type='button'], [role='button']",
-        "link": "a[href]",
-        "text": "p, span, div, h1, h2, h3, h4, h5, h6",
-        "all": "*"
-    }
-
-    selector = selectors.get(request.element_type, "*")
+    selector = ELEMENT_TYPE_SELECTORS.get(request.element_type, "*")
 
     try:
         elements = await tab.select_all(selector, timeout=TIMEOUTS.element_find)
-        results = []
-
-        for elem in elements[:50]:  # Limit to 50
-            if elem:
-                position = await elem.get_position()
-                if position and (not request.visible_only or position.width > 0):
-                    results.append({
-                        "tagName": elem.tag_name,
-                        "text": elem.text[:100] if elem.text else None,
-                        "id": elem.attrs.get("id"),
-                        "className": elem.attrs.get("class"),
-                        "href": elem.attrs.get("href"),
-                        "position": {
-                            "x": position.left,
-                            "y": position.top,
-                            "width": position.width,
-                            "height": position.height
-                        } if position else None
-                    })
+        top = [elem for elem in elements[:50] if elem]  # Limit to 50
+
+        # Positions are independent CDP calls; fetch them concurrently
+        positions = await asyncio.gather(*(elem.get_position() for elem in top))
+
+        # Filter on position first; text/attrs are only read for the survivors
+        visible = [
+            (elem, position)
+            for elem, position in zip(top, positions)
+            if position and (not request.visible_only or position.width > 0)
+        ]
+        results = [_describe_element(elem, position) for elem, position in visible]
 
         return {
             "status": "success",
@@ -345,6 +467,23 @@ async def get_element_position(
 # Tab Navigation
 # ===========================
 
+# Describes document.activeElement after tab navigation
+_FOCUSED_ELEMENT_JS = """
+    (() => {
+        const el = document.activeElement;
+        if (!el) return null;
+        return {
+            tagName: el.tagName,
+            type: el.type || null,
+            id: el.id || null,
+            className: el.className || null,
+            text: el.innerText ? el.innerText.substring(0, 100) : null,
+            placeholder: el.placeholder || null,
+            href: el.href || null
+        };
+    })()
+"""
+
 @router.post("/interaction/tab_navigate")
 async def tab_navigate(
     browser_manager: Annotated[BrowserManager, Depends(get_browser_manager)],
@@ -354,37 +493,25 @@ async def tab_navigate(
     tab = await browser_manager.get_tab()
 
     try:
-        # Press Tab key the specified number of times
+        if request.shift:
+            # Shift+Tab (go backwards)
+            press = [
+                ("keyDown", "Shift"), ("keyDown", "Tab"),
+                ("keyUp", "Tab"), ("keyUp", "Shift")
+            ]
+        else:
+            # Tab (go forwards)
+            press = [("keyDown", "Tab"), ("keyUp", "Tab")]
+
+        # Awaited one by one: tab.send registers handlers before writing to the
+        # socket, so concurrent sends are not guaranteed to reach Chrome in order.
+        # No sleep between presses; focus moves with each trusted key event
         for _ in range(request.count):
-            if request.shift:
-                # Shift+Tab (go backwards)
-                await tab.send(cdp_input.dispatch_key_event(type_="keyDown", key="Shift"))
-                await tab.send(cdp_input.dispatch_key_event(type_="keyDown", key="Tab"))
-                await tab.send(cdp_input.dispatch_key_event(type_="keyUp", key="Tab"))
-                await tab.send(cdp_input.dispatch_key_event(type_="keyUp", key="Shift"))
-            else:
-                # Tab (go forwards)
-                await tab.send(cdp_input.dispatch_key_event(type_="keyDown", key="Tab"))
-                await tab.send(cdp_input.dispatch_key_event(type_="keyUp", key="Tab"))
-
-            await asyncio.sleep(0.1)
-
-        # Get information about the currently focused element
-        focused_element = await safe_evaluate(tab, """
-            const el = document.activeElement;
-            if (el) {
-                return {
-                    tagName: el.tagName,
-                    type: el.type || null,
-                    id: el.id || null,
-                    className: el.className || null,
-                    text: el.innerText ? el.innerText.substring(0, 100) : null,
-                    placeholder: el.placeholder || null,
-                    href: el.href || null
-                };
-            }
-            return null;
-        """)
+            for type_, key in press:
+                await tab.send(cdp_input.dispatch_key_event(type_=type_, key=key))
+
+        # Read focus only once the last key event has landed
+        focused_element = await safe_evaluate(tab, _FOCUSED_ELEMENT_JS)
 
         return {
             "status": "success",
@@ -5,6 +5,7 @@ Network API response capture routes
 import asyncio
 import json
 import re
+import weakref
 from typing import Annotated, Optional, List, Dict, Any
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
@@ -19,6 +20,23 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Stop capturing once matching responses exist and none arrived for this long
+CAPTURE_IDLE_WINDOW = 0.3  # seconds
+
+# id() of tabs whose Network domain is already enabled. zendriver's Tab defines
+# __eq__ without __hash__, so tabs can't go in a set; a finalizer drops the id
+# when the tab is collected, before the id can be reused
+_network_enabled_tabs: set = set()
+
+
+async def _ensure_network_enabled(tab):
+    """Enable the CDP Network domain once per tab instead of once per capture"""
+    tab_id = id(tab)
+    if tab_id not in _network_enabled_tabs:
+        await tab.send(cdp.network.enable())
+        _network_enabled_tabs.add(tab_id)
+        weakref.finalize(tab, _network_enabled_tabs.discard, tab_id)
+
 
 # ===========================
 # API Response Capture
@@ -46,10 +64,14 @@ async def capture_api_response(
     """
     tab = await browser_manager.get_tab()
     captured_responses: List[Dict[str, Any]] = []
+    response_captured = asyncio.Event()
 
     try:
-        # Enable network domain
-        await tab.send(cdp.network.enable())
+        # Enable network domain (no-op after the first capture on this tab)
+        await _ensure_network_enabled(tab)
+
+        # Compile the pattern once rather than per ResponseReceived event
+        api_pattern = re.compile(request.api_pattern) if request.api_pattern else None
 
         # Handler to capture responses
         def response_handler(event):
@@ -61,9 +83,8 @@ async def capture_api_response(
                 response = event.response
 
                 # Check if matches pattern (if provided)
-                if request.api_pattern:
-                    if not re.search(request.api_pattern, response.url):
-                        return
+                if api_pattern and not api_pattern.search(response.url):
+                    return
 
                 # Check if JSON content type
                 content_type = response.headers.get("content-type", "").lower()
@@ -76,6 +97,7 @@ async def capture_api_response(
                     "url": response.url,
                     "status": response.status
                 })
+                response_captured.set()
 
             except Exception as e:
                 logger.warning(f"Error in response handler: {e}")
@@ -101,8 +123,22 @@ async def capture_api_response(
             else:
                 raise HTTPException(status_code=400, detail=f"Invalid action: {request.action}")
 
-            # Wait for responses to be captured
-            await asyncio.sleep(request.timeout)
+            # Wait for responses: return early once traffic goes idle, capped at request.timeout
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + request.timeout
+            while (remaining := deadline - loop.time()) > 0:
+                # A pattern capture only ever returns the first match
+                if api_pattern and captured_responses:
+                    break
+                try:
+                    await asyncio.wait_for(
+                        response_captured.wait(),
+                        timeout=min(CAPTURE_IDLE_WINDOW, remaining)
+                    )
+                    response_captured.clear()
+                except asyncio.TimeoutError:
+                    if captured_responses:
+                        break
 
         finally:
             # ALWAYS remove handler
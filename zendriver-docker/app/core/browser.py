@@ -12,6 +12,7 @@ from pathlib import Path
 import zendriver as zd
 from zendriver import cdp
 from app.core.timeouts import TIMEOUTS
+from app.utils.browser_utils import batched_evaluate
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,10 @@ _browser = None
 _browser_tab = None
 _browser_lock = asyncio.Lock()
 _tab_creation_lock = asyncio.Lock()  # Separate lock for tab operations
+_tab_verified_at = 0.0  # loop time of the last successful tab health check
+
+# A tab that passed a health check this recently is handed out without re-probing
+TAB_HEALTH_TTL = 2.0  # seconds
 
 async def is_browser_alive(browser_or_tab) -> tuple[bool, str]:
     """Centralized browser/tab health check with detailed error reporting"""
@@ -54,6 +59,13 @@ class BrowserManager:
         self.session_data_dir = self.secure_base / "session-data"
         self._safe_mkdir(self.session_data_dir)
 
+        # Wakes the periodic session saver for an immediate save
+        self.save_requested = asyncio.Event()
+
+    def request_session_save(self):
+        """Ask the periodic saver to persist session data now instead of at the next interval"""
+        self.save_requested.set()
+
     def _create_secure_base_dir(self) -> Path:
         """Create a secure base directory that can't be escaped"""
         base_dir = Path(tempfile.gettempdir()) / "pebkac_profiles"
@@ -126,12 +138,18 @@ class BrowserManager:
 
     async def get_tab(self):
         """Get the current tab - ALWAYS reuse the same one with race condition protection"""
-        global _browser_tab
+        global _browser_tab, _tab_verified_at
+
+        # Warm path: skip the CDP health probe for a recently verified tab
+        loop = asyncio.get_running_loop()
+        if _browser_tab and loop.time() - _tab_verified_at < TAB_HEALTH_TTL:
+            return _browser_tab
 
         # Quick check without lock (double-checked locking pattern)
         if _browser_tab:
             is_alive, health_msg = await is_browser_alive(_browser_tab)
             if is_alive:
+                _tab_verified_at = loop.time()
                 return _browser_tab
             else:
                 logger.warning(f"Tab health check failed: {health_msg}")
@@ -142,10 +160,12 @@ class BrowserManager:
             if _browser_tab:
                 is_alive, health_msg = await is_browser_alive(_browser_tab)
                 if is_alive:
+                    _tab_verified_at = loop.time()
                     return _browser_tab
                 else:
                     logger.warning(f"Tab health check failed after lock: {health_msg}")
             _browser_tab = None
+            _tab_verified_at = 0.0
 
             # Get or create tab
             browser = await self.get_browser()
@@ -384,9 +404,11 @@ class BrowserManager:
                 except (asyncio.TimeoutError, Exception) as e:
                     logger.warning(f"Wait element not found: {wait_for} - {e}")
 
-            # Get current state
-            current_url = await tab.evaluate("window.location.href")
-            title = await tab.evaluate("document.title")
+            # Get current state (coalesced into one evaluate)
+            current_url, title = await asyncio.gather(
+                batched_evaluate(tab, "window.location.href"),
+                batched_evaluate(tab, "document.title")
+            )
 
             return {
                 "status": "success",
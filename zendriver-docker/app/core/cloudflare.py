@@ -2,17 +2,51 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import TYPE_CHECKING, Optional
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 
 from zendriver import cdp, util
 from zendriver.core.element import Element
 
+from app.core.exceptions import SolverBusyError
+
 if TYPE_CHECKING:
     from zendriver.core.tab import Tab
 
 
 logger = logging.getLogger(__name__)
 
+# Marker present in the challenge iframe src / shadow root markup
+CF_CHALLENGE_HOST = "challenges.cloudflare.com"
+
+# verify_cf drives the single shared tab for up to `timeout` seconds, so
+# solves run one at a time and callers are turned away once too many wait.
+CF_SOLVE_MAX_PENDING = 8
+_cf_solve_semaphore = asyncio.Semaphore(1)
+_cf_solve_pending = 0
+
+
+@asynccontextmanager
+async def cf_solve_slot() -> AsyncIterator[None]:
+    """
+    Serializes Cloudflare solves on the shared tab.
+
+    Raises:
+        SolverBusyError: If CF_SOLVE_MAX_PENDING solves are already running or queued.
+    """
+    global _cf_solve_pending
+    if _cf_solve_pending >= CF_SOLVE_MAX_PENDING:
+        raise SolverBusyError(
+            f"Cloudflare solver busy ({_cf_solve_pending} solves pending)"
+        )
+
+    _cf_solve_pending += 1
+    try:
+        async with _cf_solve_semaphore:
+            yield
+    finally:
+        _cf_solve_pending -= 1
+
 
 async def cf_find_interactive_challenge(
     tab: Tab,
@@ -52,16 +86,29 @@ async def cf_find_interactive_challenge(
 
             # Check if the shadow root content is the Cloudflare challenge.
             html_content = await shadow_root_element.get_html()
-            if "challenges.cloudflare.com" in html_content:
+            if CF_CHALLENGE_HOST in html_content:
                 logger.debug("Found Cloudflare challenge in a shadow root.")
-                # If the shadow root is found, search for the specific iframe within it.
-                for child_element in shadow_root_element.children:
-                    if "challenges.cloudflare.com" in await child_element.get_html():
-                        # Found! Create the host element and return everything.
-                        logger.debug("Found challenge iframe.")
-                        host_element = Element(host_node, tab, doc)
-                        challenge_iframe = child_element
-                        return host_element, shadow_root_element, challenge_iframe
+                children = shadow_root_element.children
+                # The iframe's src is already on the node, so match it without
+                # another get_html round-trip per child.
+                challenge_iframe = next(
+                    (
+                        child
+                        for child in children
+                        if CF_CHALLENGE_HOST in (child.attrs.get("src") or "")
+                    ),
+                    None,
+                )
+                if challenge_iframe is None:
+                    for child_element in children:
+                        if CF_CHALLENGE_HOST in await child_element.get_html():
+                            challenge_iframe = child_element
+                            break
+                if challenge_iframe is not None:
+                    # Found! Create the host element and return everything.
+                    logger.debug("Found challenge iframe.")
+                    host_element = Element(host_node, tab, doc)
+                    return host_element, shadow_root_element, challenge_iframe
 
     # If the loops finish without finding anything, return None.
     logger.debug("Cloudflare interactive challenge not found.")
@@ -163,13 +210,13 @@ async def verify_cf(
 
     await challenge_iframe.scroll_into_view()
 
-    # To get the element's dimensions, its numeric 'node_id' is needed.
-    # This ID is obtained from the underlying node object.
+    # Address the iframe by its backend node id: unlike 'node_id', it stays
+    # valid after the scroll, so the box model is fetched in a single call.
     logger.debug(
-        f"Getting box model for challenge iframe (node_id: {challenge_iframe.node.node_id})"
+        f"Getting box model for challenge iframe (backend_node_id: {challenge_iframe.node.backend_node_id})"
     )
     box_model_result = await tab.send(
-        cdp.dom.get_box_model(node_id=challenge_iframe.node.node_id)
+        cdp.dom.get_box_model(backend_node_id=challenge_iframe.node.backend_node_id)
     )
     # 'content_quad' is a list of 8 numbers representing the (x, y) coordinates
     # of the four corners of the element's "content-box": [x1, y1, x2, y2, x3, y3, x4, y4].
@@ -237,7 +284,9 @@ async def verify_cf(
         try:
             # Wait for element to be loaded/attached to DOM
             await input_el.update()
-            # Re-query to verify element still exists in current DOM
+            # Re-query to verify element still exists in current DOM. Kept after
+            # update(): both fetch DOM.getDocument, and overlapping calls invalidate
+            # each other's nodeIds, which would read as a vanished (solved) input.
             fresh_input = await host_el.query_selector(current_sltr)
         except Exception as e:
             raise Exception(f"Error checking input element: {e}.")
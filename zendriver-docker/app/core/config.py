@@ -31,6 +31,7 @@ class Settings(BaseSettings):
     cache_enabled: bool = True
     cache_ttl: int = 300  # 5 minutes
     redis_url: Optional[str] = None  # Use Redis if available
+    cache_hedged_l2: bool = False  # Query DuckDB L2 alongside L1 instead of only after an L1 miss
     
     # API settings
     cors_origins: List[str] = ["*"]
@@ -93,14 +93,31 @@ class DatabaseManager:
     
     def save_research_session(self, workflow_id: str, topic: str, data: Dict[str, Any]):
         """Save research session data"""
+        self.save_research_sessions([{"workflow_id": workflow_id, "topic": topic, "data": data}])
+
+    def save_research_sessions(self, sessions: List[Dict[str, Any]]):
+        """Save several research sessions (workflow_id, topic, data) in one transaction"""
         db = next(get_db())
         try:
-            repo = ResearchRepository(db)
-            existing = repo.get_session(workflow_id)
-            if existing:
-                repo.update_session(workflow_id, data)
-            else:
-                repo.create_session(workflow_id, topic, data)
+            existing = {
+                s.workflow_id: s
+                for s in db.query(ResearchSession).filter(
+                    ResearchSession.workflow_id.in_([item["workflow_id"] for item in sessions])
+                )
+            }
+            for item in sessions:
+                session = existing.get(item["workflow_id"])
+                if session:
+                    session.data = item["data"]
+                else:
+                    session = ResearchSession(
+                        workflow_id=item["workflow_id"],
+                        topic=item["topic"],
+                        data=item["data"]
+                    )
+                    db.add(session)
+                    existing[item["workflow_id"]] = session
+            db.commit()
         finally:
             db.close()
     
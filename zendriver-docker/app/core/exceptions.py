@@ -1,5 +1,7 @@
+from datetime import datetime
 from typing import Any, Optional, Dict
 from fastapi import HTTPException, status
+from fastapi.responses import ORJSONResponse
 
 class BrowserError(Exception):
     """Base exception for browser operations"""
@@ -20,6 +22,10 @@ class TimeoutError(BrowserError):
     """YOU TIMED OUT MUTHAFUCKA"""
     pass
 
+class SolverBusyError(BrowserError):
+    """Too many challenge solves already queued"""
+    pass
+
 # HTTP exceptions with standard format
 def element_not_found(selector: str) -> HTTPException:
     return HTTPException(
@@ -41,3 +47,10 @@ def navigation_failed(url: str, reason: str) -> HTTPException:
             "reason": reason
         }
     )
+
+# In-band error responses for routes that report failures in the body
+def error_response(error: BaseException, status_code: int = status.HTTP_200_OK, **extra: Any) -> ORJSONResponse:
+    return ORJSONResponse(
+        {"status": "error", "error": str(error), "timestamp": datetime.now(), **extra},
+        status_code=status_code
+    )
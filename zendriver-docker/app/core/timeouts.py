@@ -4,18 +4,30 @@ Short timeouts prevent context overflow by failing fast.
 """
 
 import os
+from dataclasses import dataclass
 
-class TIMEOUTS:
+
+@dataclass(frozen=True, slots=True)
+class _Timeouts:
     """Centralized timeout values in seconds"""
-    
+
     # Element finding operations (was 300s)
-    element_find = int(os.getenv("TIMEOUT_ELEMENT_FIND", "3"))
-    
+    element_find: int
+
     # HTTP requests to zendriver API (was 30s)
-    http_request = int(os.getenv("TIMEOUT_HTTP_REQUEST", "5"))
-    
-    # Content extraction operations (was 10s) 
-    http_extraction = int(os.getenv("TIMEOUT_HTTP_EXTRACTION", "8"))
-    
+    http_request: int
+
+    # Content extraction operations (was 10s)
+    http_extraction: int
+
     # Page load operations (was 15s)
-    page_load = int(os.getenv("TIMEOUT_PAGE_LOAD", "10"))
\ No newline at end of file
+    page_load: int
+
+
+# Environment is read once at import; the instance is immutable afterwards
+TIMEOUTS = _Timeouts(
+    element_find=int(os.getenv("TIMEOUT_ELEMENT_FIND", "3")),
+    http_request=int(os.getenv("TIMEOUT_HTTP_REQUEST", "5")),
+    http_extraction=int(os.getenv("TIMEOUT_HTTP_EXTRACTION", "8")),
+    page_load=int(os.getenv("TIMEOUT_PAGE_LOAD", "10")),
+)
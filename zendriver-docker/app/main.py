@@ -4,13 +4,16 @@ Zendriver Browser Automation API
 
 import asyncio
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 
 from app.core.database import init_db
-from app.api.dependencies import get_browser_manager
+from app.api.dependencies import _cache_singleton, get_agent_manager, get_browser_manager, get_database_manager
+from app.api.middleware import SingleOriginCORSMiddleware, StreamingAwareGZipMiddleware
 from app.api.routes import (
     health,
     browser,
@@ -21,26 +24,55 @@ from app.api.routes import (
     agent
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
+# Called from the lifespan, not at import: `python -m app.main` imports this module
+# twice (as __main__ and again via uvicorn), which would install a second handler
+def _start_queued_logging() -> QueueListener:
+    """Route root logging through a queue: the event loop only enqueues records, a listener thread does the writing"""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    )
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+
+    root_logger = logging.getLogger()
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(logging.INFO)
+    return listener
+
+
+def _stop_queued_logging(listener: QueueListener):
+    """Detach the queue handler and flush what the listener still holds"""
+    root_logger = logging.getLogger()
+    for handler in [h for h in root_logger.handlers if isinstance(h, QueueHandler)]:
+        root_logger.removeHandler(handler)
+    listener.stop()
+
+
 # ===========================
 # Application Lifespan
 # ===========================
 
-async def periodic_session_save(browser_manager):
-    """Save session data every 5 minutes"""
-    while True:
+async def periodic_session_save(browser_manager, stop_event: asyncio.Event):
+    """Save session data every 5 minutes, or immediately when a save is requested"""
+    save_requested = browser_manager.save_requested
+    while not stop_event.is_set():
         try:
-            await asyncio.sleep(300)  # 5 minutes
-            await browser_manager.save_session_data()
-        except asyncio.CancelledError:
+            await asyncio.wait_for(save_requested.wait(), timeout=300)  # 5 minutes
+        except asyncio.TimeoutError:
+            pass
+        save_requested.clear()
+
+        # Shutdown does its own final save
+        if stop_event.is_set():
             break
+
+        try:
+            await browser_manager.save_session_data()
         except Exception as e:
             logger.error(f"Auto-save failed: {e}")
 
@@ -48,8 +80,9 @@ async def periodic_session_save(browser_manager):
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
+    log_listener = _start_queued_logging()
     logger.info("Starting application...")
-    init_db()
+    await asyncio.to_thread(init_db)
 
     # Create single browser instance
     browser_manager = get_browser_manager()
@@ -60,25 +93,46 @@ async def lifespan(app: FastAPI):
         logger.error(f"Browser init failed: {e}")
 
     # Start periodic save task
-    save_task = asyncio.create_task(periodic_session_save(browser_manager))
+    stop_saving = asyncio.Event()
+    save_task = asyncio.create_task(periodic_session_save(browser_manager, stop_saving))
     logger.info("Started periodic session save (5 min intervals)")
 
+    # Keep the /health snapshot fresh so probes never touch the browser or DB
+    health_task = asyncio.create_task(
+        health.health_snapshot_updater(browser_manager, get_database_manager(), stop_saving)
+    )
+
     yield
 
-    # Shutdown - Cancel auto-save, save session, and cleanup browser
-    save_task.cancel()
+    # Shutdown - Stop auto-save, save session, and cleanup browser
+    stop_saving.set()
+    browser_manager.request_session_save()
+    try:
+        await asyncio.wait_for(asyncio.gather(save_task, health_task), timeout=5)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        pass
     logger.info("Saving browser session data...")
     try:
         await browser_manager.save_session_data()
     except Exception as e:
         logger.error(f"Could not save session: {e}")
 
+    # Only close the agent manager if a chat request ever created it
+    if get_agent_manager.cache_info().currsize:
+        get_agent_manager().close()
+
+    # Same for the cache service's DuckDB connection pool
+    if _cache_singleton.cache_info().currsize and _cache_singleton().duckdb:
+        _cache_singleton().duckdb.close()
+
     logger.info("Cleaning up browser...")
     try:
         await browser_manager.cleanup()
     except Exception as e:
         logger.error(f"Browser cleanup failed: {e}")
 
+    _stop_queued_logging(log_listener)
+
 
 # ===========================
 # Application Setup
@@ -89,17 +143,18 @@ app = FastAPI(
     title="Zendriver Browser Automation API",
     description="Enhanced browser automation API with Zendriver",
     version="4.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson for every route. Suits the pinned FastAPI (0.104.1 in requirements.txt, 0.119.0
+    # in uv.lock); later releases deprecate ORJSONResponse in favour of their own Pydantic
+    # serialization, so drop this line when upgrading past them
+    default_response_class=ORJSONResponse
 )
 
-# CORS middleware for control panel access
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:8888"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Compress large JSON payloads (cache stats, extraction results), not the SSE chat stream
+app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=1024, exclude_paths=["/api/chat"])
+
+# CORS middleware for control panel access (outermost, so preflights skip gzip)
+app.add_middleware(SingleOriginCORSMiddleware, allow_origin="http://localhost:8888")
 
 # Include routers
 app.include_router(health.router, tags=["health"])
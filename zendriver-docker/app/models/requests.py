@@ -1,37 +1,59 @@
-from pydantic import BaseModel, Field, field_validator, HttpUrl
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Optional, List, Dict, Any, Literal
 import re
 from app.core.timeouts import TIMEOUTS
 from app.utils.validators import validate_css_selector
 
+# Immutable once validated; unknown fields are dropped (clients send extras such as force_refresh)
+_MODEL_CONFIG = ConfigDict(frozen=True, extra='ignore')
+
+# Potentially dangerous URL schemes, matched case-insensitively in one pass
+_BLOCKED_URL_RE = re.compile(r'^(javascript:|data:|file://|chrome://|about:config)', re.IGNORECASE)
+_HAS_SCHEME_RE = re.compile(r'^https?://', re.IGNORECASE)
+
+# Control characters rejected in typed text (NUL, ESC, DEL)
+_CONTROL_CHARS_RE = re.compile('[\x00\x1b\x7f]')
+
+# substack.com or any of its subdomains, over http(s)
+_SUBSTACK_URL_RE = re.compile(r'^https?://([a-z0-9-]+\.)*substack\.com(?:[/:?#]|$)', re.IGNORECASE)
+
+# Script-injection markers rejected in XPath expressions
+_XPATH_XSS_RE = re.compile(
+    r'javascript:|<script|onerror=|onclick=|onload=|<iframe|data:|vbscript:',
+    re.IGNORECASE
+)
+
+
+def _validate_navigable_url(v):
+    """Reject dangerous URL schemes and default bare hosts to https"""
+    blocked = _BLOCKED_URL_RE.match(str(v))
+    if blocked:
+        raise ValueError(f"Blocked URL pattern: {blocked.group(1)}")
+
+    # Add https if no protocol
+    if isinstance(v, str) and not _HAS_SCHEME_RE.match(v):
+        v = f'https://{v}'
+
+    return v
+
+def _validate_substack_url(v):
+    """Accept only substack.com (or subdomain) URLs"""
+    if not _SUBSTACK_URL_RE.match(v):
+        raise ValueError("Must be a Substack URL")
+    return v
+
 class NavigationRequest(BaseModel):
     """Navigation request with validation"""
-    url: HttpUrl | str
+    model_config = _MODEL_CONFIG
+
+    url: str = Field(..., max_length=2048)
     wait_for: Optional[str] = Field(None, max_length=500)
     wait_timeout: int = Field(TIMEOUTS.element_find, ge=1, le=350)
 
     @field_validator('url')
     @classmethod
     def validate_url(cls, v):
-        # Block potentially dangerous URLs
-        blocked_patterns = [
-            r'javascript:',
-            r'data:',
-            r'file://',
-            r'chrome://',
-            r'about:config'
-        ]
-
-        url_str = str(v).lower()
-        for pattern in blocked_patterns:
-            if re.match(pattern, url_str):
-                raise ValueError(f"Blocked URL pattern: {pattern}")
-
-        # Add https if no protocol
-        if isinstance(v, str) and not v.startswith(('http://', 'https://')):
-            v = f'https://{v}'
-
-        return v
+        return _validate_navigable_url(v)
 
     @field_validator('wait_for')
     @classmethod
@@ -42,6 +64,8 @@ class NavigationRequest(BaseModel):
 
 class ClickRequest(BaseModel):
     """Click request model"""
+    model_config = _MODEL_CONFIG
+
     selector: Optional[str] = Field(None, max_length=500)
     text: Optional[str] = Field(None, max_length=500)
     wait_after: float = Field(1.0, ge=0, le=10)
@@ -54,46 +78,9 @@ class ClickRequest(BaseModel):
         return v
 
 class ExtractionRequest(BaseModel):
-    """Extraction request with metadata support"""
-    selector: Optional[str] = Field(None, max_length=500, description="CSS selector")
-    extract_text: bool = Field(True, description="Extract text content")
-    extract_href: bool = Field(False, description="Extract href attributes")
-    extract_all: bool = Field(False, description="Extract from all matching elements")
-    extract_attributes: Optional[List[str]] = Field(None, description="List of attributes to extract")
-
-    # New fields for extraction
-    extraction_strategy: Optional[str] = Field(
-        "auto",
-        description="Extraction strategy: auto|visible|all|js",
-        pattern="^(auto|visible|all|js)$"
-    )
-    include_metadata: Optional[bool] = Field(
-        False,
-        description="Include element metadata (tag, classes, position)"
-    )
-    max_depth: Optional[int] = Field(
-        None,
-        description="Max depth for recursive extraction",
-        ge=1,
-        le=60
-    )
-    timeout: Optional[int] = Field(
-        300,
-        description="Timeout for element finding in seconds",
-        ge=1,
-        le=350
-    )
-    force_refresh: Optional[bool] = Field(
-        False,
-        description="Bypass cache and force fresh extraction"
-    )
-    return_html: Optional[bool] = Field(
-        False,
-        description="Return HTML in addition to text"
-    )
-
-class ExtractionRequestComplete(BaseModel):
-    """Complete extraction request model for unified extraction endpoint"""
+    """Extraction request for the unified extraction endpoint; only fields the service acts on"""
+    model_config = _MODEL_CONFIG
+
     selector: Optional[str] = Field(None, max_length=500, description="CSS selector")
     xpath: Optional[str] = Field(None, max_length=500, description="XPath selector")
     extract_all: bool = Field(False, description="Extract from all matching elements")
@@ -102,7 +89,7 @@ class ExtractionRequestComplete(BaseModel):
     force_refresh: bool = Field(False, description="Bypass cache and force fresh extraction")
     use_cache: bool = Field(True, description="Use caching for extraction")
     include_metadata: bool = Field(True, description="Include element metadata")
-    format_style: str = Field("compact", description="Output format: compact|full|structured")
+    format_style: Literal["compact", "full", "structured"] = Field("compact", description="Output format")
 
     @field_validator('selector')
     @classmethod
@@ -116,42 +103,38 @@ class ExtractionRequestComplete(BaseModel):
     def validate_xpath(cls, v):
         if v:
             # XPath validation and XSS prevention
-            dangerous_patterns = [
-                'javascript:', '<script', 'onerror=', 'onclick=',
-                'onload=', '<iframe', 'data:', 'vbscript:'
-            ]
-            for pattern in dangerous_patterns:
-                if pattern in v.lower():
-                    raise ValueError(f"Invalid xpath: XSS attempt blocked - {pattern}")
+            dangerous = _XPATH_XSS_RE.search(v)
+            if dangerous:
+                raise ValueError(f"Invalid xpath: XSS attempt blocked - {dangerous.group(0).lower()}")
         return v
 
 class SubstackRequest(BaseModel):
     """Substack-specific request validation"""
-    publication_url: HttpUrl
+    model_config = _MODEL_CONFIG
+
+    publication_url: str = Field(..., max_length=2048)
     max_posts: int = Field(20, ge=1, le=100)
 
     @field_validator('publication_url')
     @classmethod
     def validate_substack_url(cls, v):
-        url_str = str(v)
-        if 'substack.com' not in url_str:
-            raise ValueError("Must be a Substack URL")
-        return v
+        return _validate_substack_url(v)
 
 class SubstackPublicationRequest(BaseModel):
     """Substack publication request"""
-    publication_url: HttpUrl
+    model_config = _MODEL_CONFIG
+
+    publication_url: str = Field(..., max_length=2048)
 
     @field_validator('publication_url')
     @classmethod
     def validate_substack_url(cls, v):
-        url_str = str(v)
-        if 'substack.com' not in url_str:
-            raise ValueError("Must be a Substack URL")
-        return v
+        return _validate_substack_url(v)
 
 class TypeRequest(BaseModel):
     """Type text request with content validation"""
+    model_config = _MODEL_CONFIG
+
     text: str = Field(..., min_length=1, max_length=10000)
     selector: Optional[str] = Field(None, max_length=500)
     clear_first: bool = True
@@ -162,10 +145,8 @@ class TypeRequest(BaseModel):
     @classmethod
     def validate_text_content(cls, v):
         # Prevent injection of control characters
-        control_chars = ['\x00', '\x1b', '\x7f']
-        for char in control_chars:
-            if char in v:
-                raise ValueError("Text contains invalid control characters")
+        if _CONTROL_CHARS_RE.search(v):
+            raise ValueError("Text contains invalid control characters")
         return v
 
     @field_validator('selector')
@@ -177,33 +158,19 @@ class TypeRequest(BaseModel):
 
 class OpenBackgroundTabRequest(BaseModel):
     """Request to open a URL in background tab"""
-    url: HttpUrl | str
+    model_config = _MODEL_CONFIG
+
+    url: str = Field(..., max_length=2048)
 
     @field_validator('url')
     @classmethod
     def validate_url(cls, v):
-        # Block potentially dangerous URLs
-        blocked_patterns = [
-            r'javascript:',
-            r'data:',
-            r'file://',
-            r'chrome://',
-            r'about:config'
-        ]
-
-        url_str = str(v).lower()
-        for pattern in blocked_patterns:
-            if re.match(pattern, url_str):
-                raise ValueError(f"Blocked URL pattern: {pattern}")
-
-        # Add https if no protocol
-        if isinstance(v, str) and not v.startswith(('http://', 'https://')):
-            v = f'https://{v}'
-
-        return v
+        return _validate_navigable_url(v)
 
 class CloseTabRequest(BaseModel):
     """Request to close a background tab"""
+    model_config = _MODEL_CONFIG
+
     tab_index: int = Field(..., ge=1, description="Tab index to close (must be >= 1, tab 0 is protected)")
 
     @field_validator('tab_index')
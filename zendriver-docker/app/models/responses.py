@@ -1,28 +1,41 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Any, Dict, List, Union
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
+
+# Responses are built by the server and never mutated after construction; stray keyword
+# arguments are dropped rather than rejected
+_MODEL_CONFIG = ConfigDict(frozen=True, extra='ignore')
 
 class BaseResponse(BaseModel):
     """Base response model"""
+    model_config = _MODEL_CONFIG
+
     status: str = Field(..., description="Status: success or error")
     message: str = Field(..., description="Human-readable message")
     data: Optional[Any] = Field(None, description="Response data")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=partial(datetime.now, timezone.utc))
 
 class NavigationResponse(BaseModel):
     """Navigation response"""
+    model_config = _MODEL_CONFIG
+
     url: str
     title: str
     status: str = "success"
 
 class ClickResponse(BaseModel):
     """Click response"""
+    model_config = _MODEL_CONFIG
+
     status: str = "success"
     selector: Optional[str] = None
     text: Optional[str] = None
 
 class ExtractionResult(BaseModel):
     """Standardized extraction result"""
+    model_config = _MODEL_CONFIG
+
     status: str = Field("success", description="Status: success, partial, or error")
     content: Optional[str] = Field(None, description="Main text content")
     links: Optional[List[Dict[str, str]]] = Field(None, description="Extracted links")
@@ -5,9 +5,13 @@ Agent manager for SmolAgents integration with basic streaming support
 import os
 import logging
 import asyncio
-import json
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, singledispatch
 from typing import Dict, Optional, AsyncGenerator, Any, List
+import httpx
+import orjson
 from smolagents import OpenAIServerModel
 from openai import OpenAI
 from app.services.safe_code_agent import SafeCodeAgent
@@ -36,90 +40,244 @@ from app.tools import (
 
 logger = logging.getLogger(__name__)
 
+# Seconds between "Agent working..." status events while a run is in progress
+AGENT_HEARTBEAT_INTERVAL = 5.0
+
+# Most queued execution-history rows written per SQLite transaction
+HISTORY_WRITE_BATCH = 32
+
+# Fixed stream events, shared by every request; consumers only serialize them, never mutate
+_EVENT_INITIALIZING = {"type": "status", "data": "Initializing agent..."}
+_EVENT_READY = {"type": "status", "data": "Agent ready, processing query..."}
+_EVENT_RUNNING = {"type": "status", "data": "Running agent..."}
+_EVENT_WORKING = {"type": "status", "data": "Agent working..."}
+_EVENT_PROCESSING = {"type": "status", "data": "Processing results..."}
+_EVENT_CANCELLED = {"type": "error", "data": "Request cancelled"}
+_EVENT_DONE = {"type": "done", "data": ""}
+
+# Environment configuration, read once at import
+_LLAMA_CPP_URL = os.getenv("ACTIVE_OPENAI_URL", "http://llama-cpp-server:8080/v1")
+# Tools call localhost since AgentManager runs inside zendriver container
+_ZENDRIVER_API_URL = os.getenv("ZENDRIVER_API_URL", "http://localhost:8080")
+_DUCKDB_URL = os.getenv("DUCKDB_URL", "http://duckdb-cache:9001")
+_MAX_STEPS = int(os.getenv("SMOLAGENTS_MAX_STEPS", "10"))
+_STREAM_CHUNK_SIZE = int(os.getenv("AGENT_STREAM_CHUNK_SIZE", "75"))
+# One concurrent run per llama.cpp slot unless overridden
+_AGENT_WORKERS = int(os.getenv("AGENT_WORKERS", os.getenv("LLAMACPP_PARALLEL", "1")))
+
+
+# Display names for conversation roles; anything else falls back to str.title()
+_ROLE_TITLES = {"user": "User", "assistant": "Assistant", "system": "System"}
+
+
+@lru_cache(maxsize=64)
+def _format_context(messages: tuple) -> str:
+    """Render (role, content) pairs as 'Role: content' lines, skipping empty messages"""
+    return "\n".join(
+        f"{_ROLE_TITLES.get(role) or role.title()}: {content}"
+        for role, content in messages
+        if content
+    )
+
+
+@singledispatch
+def _format_agent_output(value: Any) -> str:
+    """Render an agent's final answer as display text, dispatched on its type"""
+    return str(value)
+
+
+@_format_agent_output.register
+def _(value: str) -> str:
+    return value
+
+
+@_format_agent_output.register
+def _(value: list) -> str:
+    # Lists stay as JSON
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+
+@_format_agent_output.register
+def _(value: dict) -> str:
+    if "results" not in value or "query" not in value:
+        # Other dicts stay as JSON
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+    # Auto-format search results as beautiful markdown
+    results = value['results']
+    lines = [f"### Search: {value['query']}\n"]
+    lines.extend(
+        f"{i}. **[{r.get('title', 'Untitled')}]({r.get('url', '#')})** `{r.get('domain', '')}`"
+        for i, r in enumerate(results[:10], 1)  # Limit to 10 for display
+    )
+    if len(results) > 10:
+        lines.append(f"\n*...and {len(results) - 10} more results*")
+    return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=8)
+def _build_tools(zendriver_api_url: str, duckdb_url: str) -> tuple:
+    """Build the browser automation tool set once per (zendriver, duckdb) URL pair"""
+    return (
+        # Browser control
+        NavigateBrowserTool(zendriver_api_url),
+        GetCurrentURLTool(zendriver_api_url),
+        ClickElementTool(zendriver_api_url),
+        TypeTextTool(zendriver_api_url),
+        KeyboardNavigationTool(zendriver_api_url),
+
+        # Content extraction
+        ExtractContentTool(zendriver_api_url),
+        ParallelExtractionTool(zendriver_api_url),
+        CapturePageMarkdownTool(zendriver_api_url),
+
+        # Search and navigation
+        WebSearchTool(zendriver_api_url),
+        SearchHistoryTool(duckdb_url),
+        VisitWebpageTool(zendriver_api_url),
+
+        # Security
+        CloudflareBypassTool(zendriver_api_url),
+
+        # Utilities
+        ScreenshotTool(zendriver_api_url),
+        GetElementPositionTool(zendriver_api_url),
+        CaptureAPIResponseTool(zendriver_api_url),
+
+        # Tab management
+        OpenBackgroundTabTool(zendriver_api_url),
+        ListTabsTool(zendriver_api_url),
+        CloseTabTool(zendriver_api_url)
+    )
+
+
+def _reset_agent_state(agent: SafeCodeAgent) -> None:
+    """Drop everything a previous run left on a pooled agent.
+
+    run(reset=True) only clears memory and the monitor; variables and functions the
+    generated code defined live on in agent.state and the python executor.
+    """
+    agent.state.clear()
+    agent.execution_log = []
+    agent.last_code = None
+
+    executor = agent.python_executor
+    executor.state = {"__name__": "__main__"}
+    executor.custom_tools = {}
+    executor.send_variables(variables=agent.state)
+    executor.send_tools({**agent.tools, **agent.managed_agents})
+
 
 class AgentManager:
     """Manages SmolAgents CodeAgent instances with llama.cpp integration"""
 
     def __init__(self, llama_cpp_url: str = None, database_manager = None):
-        self.llama_cpp_url = llama_cpp_url or os.getenv("ACTIVE_OPENAI_URL", "http://llama-cpp-server:8080/v1")
-        # Tools call localhost since AgentManager runs inside zendriver container
-        self.zendriver_api_url = os.getenv("ZENDRIVER_API_URL", "http://localhost:8080")
-        self.duckdb_url = os.getenv("DUCKDB_URL", "http://duckdb-cache:9001")
-        self.max_steps = int(os.getenv("SMOLAGENTS_MAX_STEPS", "10"))
+        self.llama_cpp_url = llama_cpp_url or _LLAMA_CPP_URL
+        self.zendriver_api_url = _ZENDRIVER_API_URL
+        self.duckdb_url = _DUCKDB_URL
+        self.max_steps = _MAX_STEPS
 
-        # Track active tasks for cancellation
-        self.active_tasks: Dict[str, asyncio.Task] = {}
+        # Track active tasks for cancellation, and the agent running each one
+        self.active_tasks: Dict[str, asyncio.Future] = {}
+        self._active_agents: Dict[str, SafeCodeAgent] = {}
 
         # Store last completed result for reconnection (single-user system)
         self.last_result: Optional[str] = None
         self.last_result_time: Optional[float] = None
+        self._last_result_at = 0.0  # time.monotonic() of last_result, for age checks
         self.last_query: Optional[str] = None
 
         # Stream configuration
-        self.stream_chunk_size = int(os.getenv("AGENT_STREAM_CHUNK_SIZE", "75"))
+        self.stream_chunk_size = _STREAM_CHUNK_SIZE
+        # Up to stream_chunk_size chars ending on whitespace; unbroken runs are split at the limit
+        self._stream_chunk_re = re.compile(
+            rf".{{1,{self.stream_chunk_size}}}(?:\s|$)|.{{{self.stream_chunk_size}}}", re.S
+        )
 
-        # Database manager for execution history
+        # Database manager for execution history, written off the request path by one background task
         self.db_manager = database_manager
-
-        # Create OpenAI client pointing to llama.cpp
+        self._history_queue: asyncio.Queue = asyncio.Queue()
+        self._history_writer: Optional[asyncio.Task] = None
+
+        # Create OpenAI client pointing to llama.cpp, over a keep-alive connection pool
+        # shared by every agent this manager creates
+        self._http_client = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32, keepalive_expiry=60.0),
+            timeout=httpx.Timeout(600.0, connect=5.0)
+        )
         self.openai_client = OpenAI(
             base_url=self.llama_cpp_url,
-            api_key="dummy"  # llama.cpp doesn't need real key
+            api_key="dummy",  # llama.cpp doesn't need real key
+            http_client=self._http_client
+        )
+
+        # One model wrapper shared by every agent; concurrent runs reach llama.cpp as parallel
+        # requests on the pooled client and are batched server-side across its -np slots
+        self.model = OpenAIServerModel(
+            model_id="local-model",
+            client=self.openai_client,
+            # Keep each slot's KV cache so the shared system prompt and prior turns are not re-evaluated
+            extra_body={"cache_prompt": True}
         )
 
-        # Initialize tools
-        self.tools = self._initialize_tools()
+        # Tools are stateless HTTP wrappers, so one frozen set is shared by every manager
+        self.tools = _build_tools(self.zendriver_api_url, self.duckdb_url)
         logger.info(f"AgentManager initialized with {len(self.tools)} tools")
 
-    def _initialize_tools(self) -> List:
-        """Initialize all browser automation tools with API URLs"""
-        return [
-            # Browser control
-            NavigateBrowserTool(self.zendriver_api_url),
-            GetCurrentURLTool(self.zendriver_api_url),
-            ClickElementTool(self.zendriver_api_url),
-            TypeTextTool(self.zendriver_api_url),
-            KeyboardNavigationTool(self.zendriver_api_url),
-
-            # Content extraction
-            ExtractContentTool(self.zendriver_api_url),
-            ParallelExtractionTool(self.zendriver_api_url),
-            CapturePageMarkdownTool(self.zendriver_api_url),
-
-            # Search and navigation
-            WebSearchTool(self.zendriver_api_url),
-            SearchHistoryTool(self.duckdb_url),
-            VisitWebpageTool(self.zendriver_api_url),
-
-            # Security
-            CloudflareBypassTool(self.zendriver_api_url),
-
-            # Utilities
-            ScreenshotTool(self.zendriver_api_url),
-            GetElementPositionTool(self.zendriver_api_url),
-            CaptureAPIResponseTool(self.zendriver_api_url),
-
-            # Tab management
-            OpenBackgroundTabTool(self.zendriver_api_url),
-            ListTabsTool(self.zendriver_api_url),
-            CloseTabTool(self.zendriver_api_url)
-        ]
+        # Dedicated, bounded threads for the blocking agent.run calls. One spare thread:
+        # a run whose client disconnected finishes in the background (for reconnection),
+        # and shouldn't make the next chat wait for it
+        self._agent_executor = ThreadPoolExecutor(max_workers=_AGENT_WORKERS + 1, thread_name_prefix="agent")
+
+        # Warm agents not currently running a query; state is wiped on checkout.
+        # Built on first demand (in a thread) and kept, at most one per worker thread
+        self._idle_agents: List[SafeCodeAgent] = []
+
+    def close(self) -> None:
+        """Release the pooled LLM connections and the agent threads, flushing queued history"""
+        if self._history_writer:
+            self._history_writer.cancel()
+        pending = []
+        while not self._history_queue.empty():
+            pending.append(self._history_queue.get_nowait())
+        if pending:
+            try:
+                self.db_manager.save_research_sessions(pending)
+            except Exception as e:
+                logger.warning(f"Failed to flush research sessions: {e}")
+
+        self._agent_executor.shutdown(wait=False, cancel_futures=True)
+        self._http_client.close()
+
+    def _queue_history(self, workflow_id: str, topic: str, data: Dict[str, Any]) -> None:
+        """Queue an execution-history row, starting the writer task on first use"""
+        if self._history_writer is None:
+            self._history_writer = asyncio.create_task(self._write_history())
+        self._history_queue.put_nowait({"workflow_id": workflow_id, "topic": topic, "data": data})
+
+    async def _write_history(self):
+        """Drain queued history rows, committing each burst in a single transaction"""
+        while True:
+            batch = [await self._history_queue.get()]
+            while len(batch) < HISTORY_WRITE_BATCH and not self._history_queue.empty():
+                batch.append(self._history_queue.get_nowait())
+            try:
+                await asyncio.to_thread(self.db_manager.save_research_sessions, batch)
+                logger.info(f"Saved {len(batch)} execution(s) to research sessions")
+            except Exception as e:
+                logger.warning(f"Failed to save research sessions: {e}")  # Non-critical
 
     def create_agent(self) -> SafeCodeAgent:
         """Create a new SafeCodeAgent instance"""
         try:
-            model = OpenAIServerModel(
-                model_id="local-model",
-                client=self.openai_client
-            )
-
             agent = SafeCodeAgent(
-                tools=self.tools,
-                model=model,
+                tools=list(self.tools),
+                model=self.model,
                 max_steps=self.max_steps,
                 additional_authorized_imports=["json", "time", "re"],
                 use_structured_outputs_internally=False,
-                return_full_result=True  # Get full result object for better inspection
+                return_full_result=True,  # Get full result object for better inspection
+                step_callbacks=[self._on_agent_step]
             )
 
             logger.info(f"Created SafeCodeAgent with {len(self.tools)} tools, max_steps={self.max_steps}")
@@ -129,6 +287,27 @@ class AgentManager:
             logger.error(f"Failed to create agent: {e}")
             raise
 
+    @staticmethod
+    def _on_agent_step(memory_step, agent=None) -> None:
+        """Forward a finished step number to the run currently using this agent (agent thread)"""
+        step_number = getattr(memory_step, "step_number", None)
+        sink = getattr(agent, "progress_sink", None)
+        if step_number is not None and sink:
+            sink(step_number)
+
+    async def _checkout_agent(self) -> SafeCodeAgent:
+        """Take a warm agent from the pool, building one off the event loop when none is idle"""
+        if self._idle_agents:
+            agent = self._idle_agents.pop()
+            _reset_agent_state(agent)
+            return agent
+        return await asyncio.to_thread(self.create_agent)
+
+    def _release_agent(self, agent: SafeCodeAgent) -> None:
+        """Return an agent to the pool once its run has finished, up to one per worker thread"""
+        if len(self._idle_agents) < _AGENT_WORKERS:
+            self._idle_agents.append(agent)
+
     async def run_agent_streaming(
         self,
         query: str,
@@ -152,45 +331,73 @@ class AgentManager:
         task = None
 
         try:
-            yield {"type": "status", "data": "Initializing agent..."}
+            yield _EVENT_INITIALIZING
 
-            agent = self.create_agent()
-            yield {"type": "status", "data": "Agent ready, processing query..."}
+            agent = await self._checkout_agent()
+            yield _EVENT_READY
 
             context = self._build_context(conversation_history) if conversation_history else ""
             full_query = f"{context}\n\nUser: {query}" if context else query
 
-            yield {"type": "status", "data": "Running agent..."}
+            yield _EVENT_RUNNING
+
+            loop = asyncio.get_running_loop()
+            # Step numbers from the agent thread, then None once the run has ended
+            progress: asyncio.Queue = asyncio.Queue()
+            agent.progress_sink = lambda step: loop.call_soon_threadsafe(progress.put_nowait, step)
 
-            task = asyncio.create_task(asyncio.to_thread(agent.run, full_query))
+            run_future = self._agent_executor.submit(agent.run, full_query)
+            # The run may outlive this generator (client disconnect, cancel_agent), so the
+            # agent goes back to the pool only when its thread has actually finished
+            run_future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release_agent, agent))
+            task = asyncio.wrap_future(run_future)
 
-            # Track task if request_id provided
+            # Track task if request_id provided; it stays cancellable until the run itself ends,
+            # even if this stream is abandoned first
             if request_id:
                 self.active_tasks[request_id] = task
-
-            while not task.done():
+                self._active_agents[request_id] = agent
+                task.add_done_callback(lambda _: self.active_tasks.pop(request_id, None))
+                run_future.add_done_callback(
+                    lambda _: loop.call_soon_threadsafe(self._active_agents.pop, request_id, None)
+                )
+
+            # Report each finished step as it lands, with a heartbeat during long steps;
+            # the done callback wakes us the moment the run ends
+            task.add_done_callback(lambda _: progress.put_nowait(None))
+            while True:
                 try:
-                    result = await asyncio.wait_for(asyncio.shield(task), timeout=5.0)
-                    break
+                    step = await asyncio.wait_for(progress.get(), timeout=AGENT_HEARTBEAT_INTERVAL)
                 except asyncio.TimeoutError:
-                    yield {"type": "status", "data": "Agent working..."}
-                except asyncio.CancelledError:
-                    logger.info(f"Agent task cancelled for request: {request_id}")
-                    yield {"type": "error", "data": "Request cancelled"}
-                    return
+                    yield _EVENT_WORKING
+                    continue
+                if step is None:
+                    break
+                yield {"type": "status", "data": f"Agent step {step} complete..."}
 
-            yield {"type": "status", "data": "Processing results..."}
+            if task.cancelled():
+                logger.info(f"Agent task cancelled for request: {request_id}")
+                yield _EVENT_CANCELLED
+                return
+            result = task.result()
+
+            yield _EVENT_PROCESSING
 
             # Extract result from agent response (with return_full_result=True, we get a result object)
+            # Each attribute is read once; a missing one reads as None
+            output = getattr(result, 'output', None)
+            logs = getattr(result, 'logs', None)
             # Check for final_answer attribute first (the successful completion case)
-            if hasattr(result, 'output') and result.output is not None:
+            if output is not None:
                 # Result object with output attribute (successful final_answer call)
-                formatted_result = result.output
-                logger.info(f"Agent completed with final_answer: {str(formatted_result)[:100]}")
-            elif hasattr(result, 'final_answer') and result.final_answer:
+                formatted_result = output
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Agent completed with final_answer: {str(formatted_result)[:100]}")
+            elif final_answer := getattr(result, 'final_answer', None):
                 # Alternative attribute name
-                formatted_result = result.final_answer
-                logger.info(f"Agent completed with final_answer attribute: {str(formatted_result)[:100]}")
+                formatted_result = final_answer
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(f"Agent completed with final_answer attribute: {str(formatted_result)[:100]}")
             elif isinstance(result, str):
                 # Direct string return (shouldn't happen with return_full_result=True)
                 formatted_result = result
@@ -198,65 +405,41 @@ class AgentManager:
             else:
                 # Agent didn't complete with final_answer - extract from logs or error
                 logger.warning(f"Agent did not call final_answer(). Result type: {type(result)}")
-                if hasattr(result, 'logs') and result.logs:
-                    formatted_result = f"Agent reached max_steps without final_answer. Last step: {result.logs[-1]}"
+                if logs:
+                    formatted_result = f"Agent reached max_steps without final_answer. Last step: {logs[-1]}"
                 else:
                     formatted_result = f"Agent failed to complete task. Result: {str(result)[:200]}"
 
             # Smart formatting: search results → markdown, other dicts → JSON
-            if isinstance(formatted_result, dict) and "results" in formatted_result and "query" in formatted_result:
-                # Auto-format search results as beautiful markdown
-                md = f"### Search: {formatted_result['query']}\n\n"
-                results = formatted_result['results']
-                for i, r in enumerate(results[:10], 1):  # Limit to 10 for display
-                    title = r.get('title', 'Untitled')
-                    url = r.get('url', '#')
-                    domain = r.get('domain', '')
-                    md += f"{i}. **[{title}]({url})** `{domain}`\n"
-                if len(results) > 10:
-                    md += f"\n*...and {len(results) - 10} more results*\n"
-                formatted_result = md
-            elif isinstance(formatted_result, (dict, list)):
-                # Other dicts/lists stay as JSON
-                formatted_result = json.dumps(formatted_result, indent=2, ensure_ascii=False)
-            elif not isinstance(formatted_result, str):
-                formatted_result = str(formatted_result)
+            formatted_result = _format_agent_output(formatted_result)
 
             # Store result for potential reconnection
             self.last_result = formatted_result
             self.last_result_time = time.time()
+            self._last_result_at = time.monotonic()
             self.last_query = query
 
-            # Save execution history to SQLite
+            # Queue execution history for the background SQLite writer
             if self.db_manager:
-                try:
-                    step_count = len(result.logs) if hasattr(result, 'logs') else 0
-                    execution_data = {
-                        "query": query,
-                        "result": formatted_result[:1000],  # Truncate to 1000 chars for storage
-                        "step_count": step_count,
-                        "completed_at": time.time(),
-                        "status": "completed" if hasattr(result, 'output') and result.output else "incomplete"
-                    }
-
-                    workflow_id = request_id or f"exec_{int(time.time())}"
-                    topic = query[:200] if len(query) > 200 else query
-
-                    self.db_manager.save_research_session(
-                        workflow_id=workflow_id,
-                        topic=topic,
-                        data=execution_data
-                    )
-                    logger.info(f"Saved execution to research sessions: {workflow_id}")
-                except Exception as e:
-                    logger.warning(f"Failed to save research session: {e}")  # Non-critical
-
-            for i in range(0, len(formatted_result), self.stream_chunk_size):
-                chunk = formatted_result[i:i+self.stream_chunk_size]
-                yield {"type": "content", "data": chunk}
-                await asyncio.sleep(0.02)
-
-            yield {"type": "done", "data": ""}
+                step_count = len(logs) if logs is not None else 0
+                execution_data = {
+                    "query": query,
+                    "result": formatted_result[:1000],  # Truncate to 1000 chars for storage
+                    "step_count": step_count,
+                    "completed_at": time.time(),
+                    "status": "completed" if output else "incomplete"
+                }
+
+                workflow_id = request_id or f"exec_{int(time.time())}"
+                topic = query[:200] if len(query) > 200 else query
+
+                self._queue_history(workflow_id, topic, execution_data)
+
+            # Word-boundary chunks, sent back to back with no throttle
+            for match in self._stream_chunk_re.finditer(formatted_result):
+                yield {"type": "content", "data": match.group()}
+
+            yield _EVENT_DONE
             logger.info("Agent completed successfully")
 
         except asyncio.CancelledError:
@@ -272,24 +455,16 @@ class AgentManager:
                 "data": f"Agent error: {str(e)}"
             }
 
-        finally:
-            # Clean up task tracking
-            if request_id and request_id in self.active_tasks:
-                del self.active_tasks[request_id]
-
     def _build_context(self, history: List[Dict]) -> str:
         """Build conversation context from history"""
         if not history:
             return ""
 
-        context_lines = []
-        for msg in history[-6:]:  # Last 6 messages
-            role = msg.get('role', 'user')
-            content = msg.get('content', '')
-            if content:  # Only add non-empty messages
-                context_lines.append(f"{role.title()}: {content}")
-
-        return "\n".join(context_lines) if context_lines else ""
+        # Last 6 messages; the formatted text is memoized on their (role, content) pairs
+        return _format_context(tuple(
+            (msg.get('role', 'user'), msg.get('content', ''))
+            for msg in history[-6:]
+        ))
 
     async def cancel_agent(self, request_id: str) -> bool:
         """
@@ -301,12 +476,16 @@ class AgentManager:
         Returns:
             True if task was found and cancelled, False otherwise
         """
-        if request_id in self.active_tasks:
-            task = self.active_tasks[request_id]
-            if not task.done():
-                task.cancel()
-                logger.info(f"Cancelled agent task: {request_id}")
-                return True
+        task = self.active_tasks.get(request_id)
+        if task and not task.done():
+            # Cancelling only stops a run still queued for a thread; one already running
+            # is interrupted cooperatively and stops before its next step, freeing the worker
+            agent = self._active_agents.get(request_id)
+            if agent:
+                agent.interrupt()
+            task.cancel()
+            logger.info(f"Cancelled agent task: {request_id}")
+            return True
         return False
 
     def get_last_result(self, max_age_seconds: int = 300) -> Optional[Dict[str, Any]]:
@@ -322,7 +501,7 @@ class AgentManager:
         if not self.last_result or not self.last_result_time:
             return None
 
-        age = time.time() - self.last_result_time
+        age = time.monotonic() - self._last_result_at
         if age > max_age_seconds:
             return None
 
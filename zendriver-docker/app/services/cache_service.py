@@ -2,23 +2,138 @@
 import asyncio
 import hashlib
 import json
-import pickle
+import re
 import time
 import os
-from typing import Optional, Dict, List, Any, Tuple
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from itertools import islice
+from functools import lru_cache
+from typing import Optional, Dict, List, Any, Tuple, NamedTuple
 from datetime import datetime, timedelta
 from urllib.parse import urlparse
+from sqlalchemy import case, func
+from app.core.database import get_db, ResearchSession
 from app.utils.cache import CacheManager
 from app.utils.cache_utils import CacheKeyGenerator
 from app.utils.duckdb_client import DuckDBClient
 import logging
 logger = logging.getLogger(__name__)
 
+# Cache policy patterns, matched case-insensitively in one pass each
+# URLs of search engines/search pages and real-time endpoints are never cached
+_BYPASS_URL_RE = re.compile(
+    r'duckduckgo\.com|google\.com|bing\.com|search|/api/|/live/|/current/|/now/|/realtime/',
+    re.IGNORECASE
+)
+_SEARCH_CONTEXT_RE = re.compile(r'search', re.IGNORECASE)
+# Selectors for fast-changing values
+_DYNAMIC_SELECTOR_RE = re.compile(r'\.(?:price|stock|timestamp|live|current|now)', re.IGNORECASE)
+# Selectors for page structure that rarely changes
+_STRUCTURAL_SELECTOR_RE = re.compile(r'nav|header|footer|menu|form|input\[|button\[|\[role', re.IGNORECASE)
+# Any CSS syntax; selectors without it are plain text lookups
+_CSS_SYNTAX_RE = re.compile(r'[.#\[:>]')
+# URL indicators per content type; one scan reports every category present
+_CONTENT_TYPE_URL_RE = re.compile(
+    r'(?P<search>google\.|bing\.|duckduckgo\.|yahoo\.|baidu\.)'
+    r'|(?P<product>/product|/item|/p/|amazon\.|ebay\.|alibaba\.|shopify\.)'
+    r'|(?P<forum>forum|discuss|reddit\.|discourse|/t/|community)',
+    re.IGNORECASE
+)
+
+class CachePolicy(NamedTuple):
+    """Caching decision for one (url, selector, context) request"""
+    bypass: bool     # Never read or write the cache
+    cacheable: bool  # Content may be stored
+    ttl: int         # Seconds to keep it; 0 means don't cache
+
+
+@lru_cache(maxsize=32)
+def _word_set(text: str) -> frozenset:
+    """Lowercased word set of a text; cached content is re-checked often, so its set is reused"""
+    return frozenset(text.lower().split())
+
+
+@lru_cache(maxsize=256)
+def _classify_content_type(url: str, is_article: bool) -> str:
+    """Content type for a URL; entries are re-checked often, so each URL is scanned once"""
+    # Categories keep their precedence even when a lower one appears earlier in the URL
+    found = {m.lastgroup for m in _CONTENT_TYPE_URL_RE.finditer(url)}
+
+    # Search engines - never cache
+    if 'search' in found:
+        return 'search'
+
+    # E-commerce/product pages
+    if 'product' in found:
+        return 'product'
+
+    # News sites (check metadata)
+    if is_article:
+        return 'news'
+
+    # Forum/discussion sites
+    if 'forum' in found:
+        return 'forum'
+
+    # Default to static
+    return 'static'
+
+
+# Payloads larger than this are persisted to L2 because they are expensive to re-extract
+L2_PERSIST_MIN_BYTES = 10_000
+
+# Best-selector lists per (domain, element_type) are reused in-process for this long,
+# so repeat extractions on a domain skip the DuckDB thread hop
+SELECTOR_CACHE_TTL = 60
+SELECTOR_CACHE_MAX_ITEMS = 1024
+
+
+def _estimate_size(data: Any, limit: int = L2_PERSIST_MIN_BYTES) -> int:
+    """Rough payload size from str/bytes leaf lengths; stops counting once past limit"""
+    total = 0
+    stack = [data]
+    while stack and total <= limit:
+        item = stack.pop()
+        if isinstance(item, (str, bytes)):
+            total += len(item)
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        else:
+            total += 8  # Scalars and other leaves
+    return total
+
+
+async def _singleflight(key_map: Dict, key, coro_factory):
+    """Await the task already running for key, or start one via coro_factory and share it.
+
+    The task is shielded, so one caller going away doesn't cancel it for the others.
+    """
+    task = key_map.get(key)
+    if task is None:
+        task = asyncio.create_task(coro_factory())
+        key_map[key] = task
+        task.add_done_callback(lambda _: key_map.pop(key, None))
+    return await asyncio.shield(task)
+
+
 class ExtractorCacheService:
     """Cache service for extraction operations with L1 (Redis) + L2 (DuckDB) tiering"""
 
     def __init__(self, cache_manager: CacheManager, duckdb_url: Optional[str] = None):
         self.cache = cache_manager
+        self.hedged_l2 = getattr(cache_manager.settings, 'cache_hedged_l2', False)
+
+        # Tiered lookups in flight, so concurrent misses on one key share a single L1/L2 round-trip
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        # (domain, element_type) -> (selectors, expires_at), least recently used first
+        self._selector_cache: OrderedDict = OrderedDict()
+        # DuckDB selector fetches in flight, shared by concurrent misses on the same key
+        self._selector_fetches: Dict[Tuple[str, str], asyncio.Task] = {}
 
         # Initialize DuckDB L2 cache (optional but recommended)
         self.duckdb = None
@@ -50,42 +165,58 @@ class ExtractorCacheService:
 
         Flow:
         1. Check L1 (Redis) - 10ms latency
-        2. If miss, check L2 (DuckDB) - 50-100ms latency
+        2. If miss, check L2 (DuckDB) - 50-100ms latency (started alongside L1 when hedged)
         3. If L2 hit, promote to L1 for future fast access
         4. Return None if both miss
         """
         # Don't return cache for search operations
-        if self.should_bypass_cache(url, selector or "", context):
+        if self._classify_request(url, selector, context).bypass:
             return None
 
         key = self._make_url_key(url, selector, context)
 
+        return await _singleflight(self._inflight, key, lambda: self._lookup_extraction(key))
+
+    async def _lookup_extraction(self, key: str) -> Optional[Dict]:
+        """Tiered L1 -> L2 lookup for one cache key"""
+        # Hedged mode: start the L2 fetch now so an L1 miss costs max(L1, L2), not L1 + L2
+        l2_task = asyncio.create_task(self._get_l2_extraction(key)) if self.duckdb and self.hedged_l2 else None
+
         # L1 (Redis) lookup
         l1_result = await self.cache.get(key)
         if l1_result:
+            if l2_task:
+                l2_task.cancel()
             logger.debug(f"L1 cache hit: {key[:50]}")
             return l1_result
 
         # L2 (DuckDB) lookup if available
         if self.duckdb:
-            try:
-                l2_result = await asyncio.to_thread(self.duckdb.get_cached_page, key)
-                if l2_result:
-                    logger.info(f"L2 cache hit, promoting to L1: {key[:50]}")
-                    # Promote to L1 for future fast access
-                    await self.cache.set(
-                        key,
-                        l2_result['data'],
-                        ttl=l2_result.get('ttl', 3600)
-                    )
-                    return l2_result['data']
-            except Exception as e:
-                logger.warning(f"L2 cache lookup failed: {e}")
+            l2_result = await (l2_task or self._get_l2_extraction(key))
+            if l2_result:
+                return l2_result
 
         # Total miss
         logger.debug(f"Cache miss (L1+L2): {key[:50]}")
         return None
-    
+
+    async def _get_l2_extraction(self, key: str) -> Optional[Dict]:
+        """Look up a key in DuckDB L2, promoting a hit to L1"""
+        try:
+            l2_result = await asyncio.to_thread(self.duckdb.get_cached_page, key)
+            if l2_result:
+                logger.info(f"L2 cache hit, promoting to L1: {key[:50]}")
+                # Promote to L1 for future fast access
+                await self.cache.set(
+                    key,
+                    l2_result['data'],
+                    ttl=l2_result.get('ttl', 3600)
+                )
+                return l2_result['data']
+        except Exception as e:
+            logger.warning(f"L2 cache lookup failed: {e}")
+        return None
+
     async def cache_extraction(self, url: str, selector: Optional[str], data: Dict, ttl: int = 3600, context: str = ""):
         """
         Cache extraction result with intelligent TTL
@@ -95,7 +226,7 @@ class ExtractorCacheService:
         - L2 (DuckDB): Write if TTL >= 1 hour OR data size >= 10KB (expensive to re-extract)
         """
         # Use smart TTL based on selector type and context
-        smart_ttl = self.get_cache_ttl(url, selector or "", context)
+        smart_ttl = self._classify_request(url, selector, context).ttl
         if smart_ttl == 0:
             logger.debug(f"Skipping cache (TTL=0): {url[:50]}, selector={selector}, context={context}")
             return  # Don't cache
@@ -109,16 +240,15 @@ class ExtractorCacheService:
         # 1. Long TTL (worth persisting)
         # 2. Large data (expensive to re-extract)
         if self.duckdb:
-            data_size = len(pickle.dumps(data))
-
+            # Size only matters when neither cheap rule already decides
             should_persist = (
                 (selector or '') == 'universal' or  # Expensive Trafilatura extractions
                 smart_ttl >= 3600 or  # 1+ hour TTL
-                data_size > 10_000  # 10KB+ data
+                _estimate_size(data) > L2_PERSIST_MIN_BYTES  # 10KB+ data
             )
 
             if not should_persist:
-                logger.debug(f"Skipping L2 (selector={selector}, TTL={smart_ttl}s, size={data_size}b)")
+                logger.debug(f"Skipping L2 (selector={selector}, TTL={smart_ttl}s, size<={L2_PERSIST_MIN_BYTES}b)")
 
             if should_persist:
                 metadata = {
@@ -138,7 +268,7 @@ class ExtractorCacheService:
                         ttl=smart_ttl,
                         metadata=metadata
                     )
-                    logger.info(f"Persisted to L2: {key[:50]} (TTL: {smart_ttl}s, Size: {data_size}b)")
+                    logger.info(f"Persisted to L2: {key[:50]} (TTL: {smart_ttl}s)")
                 except Exception as e:
                     logger.error(f"L2 cache write failed: {e}")
     
@@ -151,11 +281,10 @@ class ExtractorCacheService:
         - DuckDB: Persistent storage for long-term memory
         """
         key = self._make_selector_key(domain, selector, success)
-        count = await self.cache.get(key) or 0
 
         # Get selector TTL from environment (default 90 days)
         selector_ttl = int(os.getenv("CACHE_TTL_SELECTOR", "7776000"))  # 90 days default
-        await self.cache.set(key, count + 1, ttl=selector_ttl)
+        await self.cache.incr(key, ttl=selector_ttl)
 
         # Also sync to DuckDB for persistence
         if self.duckdb:
@@ -176,11 +305,27 @@ class ExtractorCacheService:
         Get best performing selectors for a domain from DuckDB.
 
         DuckDB stores actual selector strings and persists across restarts.
+        Results are kept in-process for SELECTOR_CACHE_TTL seconds.
         Returns empty list if DuckDB unavailable.
         """
         if not self.duckdb:
             return []
 
+        cache_key = (domain, element_type)
+        entry = self._selector_cache.get(cache_key)
+        if entry is not None:
+            if entry[1] > time.monotonic():
+                self._selector_cache.move_to_end(cache_key)
+                return entry[0]
+            del self._selector_cache[cache_key]
+
+        return await _singleflight(
+            self._selector_fetches, cache_key, lambda: self._fetch_best_selectors(domain, element_type)
+        )
+
+    async def _fetch_best_selectors(self, domain: str, element_type: str) -> List[Dict[str, Any]]:
+        """Read best selectors from DuckDB and keep them in the in-process cache"""
+        cache_key = (domain, element_type)
         try:
             selectors = await asyncio.to_thread(
                 self.duckdb.get_best_selectors,
@@ -188,6 +333,10 @@ class ExtractorCacheService:
                 element_type
             )
             logger.debug(f"Got {len(selectors)} best selectors from DuckDB for {domain}")
+
+            self._selector_cache[cache_key] = (selectors, time.monotonic() + SELECTOR_CACHE_TTL)
+            if len(self._selector_cache) > SELECTOR_CACHE_MAX_ITEMS:
+                self._selector_cache.popitem(last=False)
             return selectors
         except Exception as e:
             logger.error(f"Failed to get best selectors from DuckDB: {e}")
@@ -195,84 +344,53 @@ class ExtractorCacheService:
 
     def _sanitize_value(self, value: Any) -> str:
         """Handle RemoteObject and other types consistently"""
+        if type(value) is str:  # Common case
+            return value
         if hasattr(value, 'value'):  # RemoteObject
             return str(value.value) if value.value is not None else ""
         if isinstance(value, tuple) and len(value) >= 1:
             return self._sanitize_value(value[0])
         return str(value) if value is not None else ""
 
-    def should_bypass_cache(self, url: str, selector: str, context: Any) -> bool:
-        """Determine if caching should be bypassed based on URL/context patterns"""
-
+    def _classify_request(self, url: Any, selector: Any, context: Any) -> CachePolicy:
+        """Sanitize the inputs once and derive every caching decision from them"""
         # Use centralized sanitization for RemoteObject handling
         url = self._sanitize_value(url)
         selector = self._sanitize_value(selector)
         context = self._sanitize_value(context)
 
-        # 1. Search operations - never cache
-        if "search" in context.lower() or any(engine in url.lower() for engine in [
-            "duckduckgo.com", "google.com", "bing.com", "search"
-        ]):
-            return True
+        # Search operations and real-time data URLs - never cache
+        if _SEARCH_CONTEXT_RE.search(context) or _BYPASS_URL_RE.search(url):
+            return CachePolicy(bypass=True, cacheable=False, ttl=0)
 
-        # 2. Real-time data URLs - bypass cache
-        realtime_patterns = ["/api/", "/live/", "/current/", "/now/", "/realtime/"]
-        if any(pattern in url.lower() for pattern in realtime_patterns):
-            return True
-        
-        return False
+        # Dynamic content selectors - no cache
+        if _DYNAMIC_SELECTOR_RE.search(selector):
+            return CachePolicy(bypass=False, cacheable=False, ttl=0)
+
+        # Structural elements (nav, form, header) - cache long (24 hours)
+        if _STRUCTURAL_SELECTOR_RE.search(selector):
+            return CachePolicy(bypass=False, cacheable=True, ttl=86400)
+
+        # Text-based selectors (no CSS syntax) - medium cache (30 minutes)
+        if not _CSS_SYNTAX_RE.search(selector):
+            return CachePolicy(bypass=False, cacheable=True, ttl=1800)
+
+        return CachePolicy(bypass=False, cacheable=True, ttl=3600)  # 1 hour default
+
+    def should_bypass_cache(self, url: str, selector: str, context: Any) -> bool:
+        """Determine if caching should be bypassed based on URL/context patterns"""
+        return self._classify_request(url, selector, context).bypass
 
     def should_cache_content(self, url: str, selector: str, context: str) -> bool:
         """Determine if content should be cached based on patterns"""
-
-        # Use centralized sanitization for RemoteObject handling
-        url = self._sanitize_value(url)
-        selector = self._sanitize_value(selector)
-        context = self._sanitize_value(context)
-        
-        # Never cache if should bypass
-        if self.should_bypass_cache(url, selector, context):
-            return False
-        
-        # Never cache dynamic content selectors
-        dynamic_selectors = [".price", ".stock", ".timestamp", ".live", ".current", ".now"]
-        if any(sel in selector.lower() for sel in dynamic_selectors):
-            return False
-            
-        return True
+        return self._classify_request(url, selector, context).cacheable
 
     def get_cache_ttl(self, url: str, selector: str, context: str) -> int:
         """Get appropriate TTL based on selector type and context"""
-
-        # Use centralized sanitization for RemoteObject handling
-        url = self._sanitize_value(url)
-        selector = self._sanitize_value(selector)
-        context = self._sanitize_value(context)
-        
-        # Search context or bypass patterns - no cache
-        if self.should_bypass_cache(url, selector, context):
-            return 0  # Don't cache
-            
-        # Dynamic content selectors - no cache
-        dynamic_patterns = [".price", ".stock", ".timestamp", ".live", ".current", ".now"]  
-        if any(dyn in selector.lower() for dyn in dynamic_patterns):
-            return 0  # Don't cache dynamic content
-            
-        # Structural elements (nav, form, header) - cache long  
-        structural_patterns = ["nav", "header", "footer", "menu", "form", "input[", "button[", "[role"]
-        if any(struct in selector.lower() for struct in structural_patterns):
-            return 86400  # 24 hours
-            
-        # Text-based selectors (no CSS syntax) - medium cache
-        if not any(css in selector for css in [".", "#", "[", ":", ">"]):
-            return 1800  # 30 minutes
-            
-        return 3600  # 1 hour default
+        return self._classify_request(url, selector, context).ttl
 
     async def get_optimized_selector(self, url: str, element_type: str = "general") -> Optional[str]:
         """Get best performing selector for this domain/element type"""
-        from urllib.parse import urlparse
-
         try:
             domain = urlparse(url).netloc
             if not domain:
@@ -330,8 +448,6 @@ class ExtractorCacheService:
 
     async def learn_selector_performance(self, url: str, selector: str, success: bool, response_data: Optional[Dict] = None):
         """Learn from selector performance for future optimization"""
-        from urllib.parse import urlparse
-
         try:
             domain = urlparse(url).netloc
             if domain:
@@ -356,6 +472,16 @@ class ExtractorCacheService:
             # Re-raise for critical performance tracking failures
             raise RuntimeError(f"Failed to learn selector performance for {url}: {e}") from e
 
+    async def _count_redis_keys(self, pattern: str) -> int:
+        """Count keys matching pattern; Redis filters server-side and keys are never decoded"""
+        count = 0
+        cursor = 0
+        while True:
+            cursor, keys = await self.cache.redis_client.scan(cursor, match=pattern, count=10_000)
+            count += len(keys)
+            if cursor == 0:
+                return count
+
     async def get_comprehensive_stats(self) -> Dict[str, Any]:
         """
         Get comprehensive cache statistics across all layers
@@ -403,12 +529,25 @@ class ExtractorCacheService:
             }
         }
 
-        # L1 (Redis) stats
+        # Sections are independent I/O and each fills only its own keys, so run them together
+        await asyncio.gather(
+            self._fill_redis_stats(stats),
+            self._fill_duckdb_stats(stats),
+            asyncio.to_thread(self._fill_session_stats, stats)
+        )
+
+        return stats
+
+    async def _fill_redis_stats(self, stats: Dict[str, Any]):
+        """L1 (Redis) section of get_comprehensive_stats"""
         if self.cache.redis_client:
             try:
-                # Get Redis INFO for memory and stats
-                memory_info = await self.cache.redis_client.info('memory')
-                stats_info = await self.cache.redis_client.info('stats')
+                # INFO memory, INFO stats and DBSIZE in one round-trip
+                pipe = self.cache.redis_client.pipeline(transaction=False)
+                pipe.info('memory')
+                pipe.info('stats')
+                pipe.dbsize()
+                memory_info, stats_info, dbsize = await pipe.execute()
 
                 stats['l1_redis']['available'] = True
 
@@ -428,25 +567,13 @@ class ExtractorCacheService:
                 stats['l1_redis']['evicted_keys'] = int(stats_info.get('evicted_keys', 0))
 
                 # Count total keys
-                dbsize = await self.cache.redis_client.dbsize()
                 stats['l1_redis']['keys_count'] = dbsize
 
                 # Count selector keys and extract keys
-                selector_count = 0
-                extract_count = 0
-                cursor = 0
-                while True:
-                    cursor, keys = await self.cache.redis_client.scan(
-                        cursor, match="*:*", count=100
-                    )
-                    for key in keys:
-                        key_str = key.decode('utf-8') if isinstance(key, bytes) else key
-                        if key_str.startswith('selector:'):
-                            selector_count += 1
-                        elif key_str.startswith('extract:'):
-                            extract_count += 1
-                    if cursor == 0:
-                        break
+                selector_count, extract_count = await asyncio.gather(
+                    self._count_redis_keys("selector:*"),
+                    self._count_redis_keys("extract:*")
+                )
 
                 stats['l1_redis']['selector_count'] = selector_count
                 stats['l1_redis']['extract_count'] = extract_count
@@ -455,7 +582,8 @@ class ExtractorCacheService:
             except Exception as e:
                 logger.error(f"Redis stats error: {e}")
 
-        # L2 (DuckDB) stats
+    async def _fill_duckdb_stats(self, stats: Dict[str, Any]):
+        """L2 (DuckDB) section of get_comprehensive_stats"""
         if self.duckdb:
             try:
                 duckdb_stats = await asyncio.to_thread(self.duckdb.get_stats)
@@ -465,42 +593,25 @@ class ExtractorCacheService:
             except Exception as e:
                 logger.error(f"DuckDB stats error: {e}")
 
-        # Research sessions stats (SQLite)
+    def _fill_session_stats(self, stats: Dict[str, Any]):
+        """Research sessions (SQLite) section of get_comprehensive_stats; blocking, run in a thread"""
         try:
-            from app.core.database import get_db, ResearchSession
-            from datetime import datetime, timedelta
-
             db = next(get_db())
             try:
-                # Total count
-                total = db.query(ResearchSession).count()
-
-                # Status counts
-                completed = db.query(ResearchSession).filter(
-                    ResearchSession.status == 'completed'
-                ).count()
-
-                # Recent (24h)
+                # One aggregate pass; step_count is read from the JSON column by the database
                 yesterday = datetime.now() - timedelta(days=1)
-                recent = db.query(ResearchSession).filter(
-                    ResearchSession.created_at >= yesterday
-                ).count()
-
-                # Average steps (from data JSON)
-                sessions_with_steps = db.query(ResearchSession).filter(
-                    ResearchSession.data.isnot(None)
-                ).all()
-
-                total_steps = 0
-                step_count = 0
-                for session in sessions_with_steps:
-                    if session.data and isinstance(session.data, dict):
-                        steps = session.data.get('step_count', 0)
-                        if steps > 0:
-                            total_steps += steps
-                            step_count += 1
-
-                avg_steps = round(total_steps / step_count, 1) if step_count > 0 else 0
+                steps = ResearchSession.data['step_count'].as_integer()
+                total, completed, recent, avg_steps = db.query(
+                    func.count(ResearchSession.id),
+                    func.sum(case((ResearchSession.status == 'completed', 1), else_=0)),
+                    func.sum(case((ResearchSession.created_at >= yesterday, 1), else_=0)),
+                    func.avg(case((steps > 0, steps)))
+                ).one()
+
+                total = total or 0
+                completed = completed or 0
+                recent = recent or 0
+                avg_steps = round(float(avg_steps), 1) if avg_steps else 0
 
                 stats['research_sessions'] = {
                     'available': True,
@@ -516,7 +627,14 @@ class ExtractorCacheService:
         except Exception as e:
             logger.error(f"Research sessions stats error: {e}")
 
-        return stats
+
+@dataclass(frozen=True, slots=True)
+class InvalidationRule:
+    """Invalidation policy for one content type"""
+    ttl: int
+    check_frequency: int
+    content_change_threshold: float
+    priority: str
 
 
 class CacheInvalidationService:
@@ -528,42 +646,23 @@ class CacheInvalidationService:
     def __init__(self, cache_manager: CacheManager):
         self.cache = cache_manager
         self.invalidation_rules = self._initialize_rules()
-        self.invalidation_history = []
         self.max_history = 1000
+        # Oldest events fall off the left as new ones arrive
+        self.invalidation_history: deque = deque(maxlen=self.max_history)
     
-    def _initialize_rules(self) -> Dict[str, Dict]:
+    def _initialize_rules(self) -> Dict[str, InvalidationRule]:
         """Define invalidation rules per content type."""
         return {
-            'news': {
-                'ttl': 3600,  # 1 hour
-                'check_frequency': 300,  # Check every 5 minutes
-                'content_change_threshold': 0.1,  # 10% change triggers invalidation
-                'priority': 'high'
-            },
-            'product': {
-                'ttl': 1800,  # 30 minutes for price changes
-                'check_frequency': 600,
-                'content_change_threshold': 0.05,  # 5% change (price sensitive)
-                'priority': 'high'
-            },
-            'static': {
-                'ttl': 86400,  # 24 hours
-                'check_frequency': 3600,
-                'content_change_threshold': 0.2,  # 20% change
-                'priority': 'low'
-            },
-            'search': {
-                'ttl': 0,  # Never cache
-                'check_frequency': 0,
-                'content_change_threshold': 0,
-                'priority': 'skip'
-            },
-            'forum': {
-                'ttl': 900,  # 15 minutes
-                'check_frequency': 300,
-                'content_change_threshold': 0.15,
-                'priority': 'medium'
-            }
+            # 1 hour TTL, check every 5 minutes, 10% change triggers invalidation
+            'news': InvalidationRule(ttl=3600, check_frequency=300, content_change_threshold=0.1, priority='high'),
+            # 30 minutes for price changes, 5% change (price sensitive)
+            'product': InvalidationRule(ttl=1800, check_frequency=600, content_change_threshold=0.05, priority='high'),
+            # 24 hours, 20% change
+            'static': InvalidationRule(ttl=86400, check_frequency=3600, content_change_threshold=0.2, priority='low'),
+            # Never cache
+            'search': InvalidationRule(ttl=0, check_frequency=0, content_change_threshold=0, priority='skip'),
+            # 15 minutes
+            'forum': InvalidationRule(ttl=900, check_frequency=300, content_change_threshold=0.15, priority='medium'),
         }
     
     async def should_invalidate(
@@ -603,8 +702,7 @@ class CacheInvalidationService:
     def _should_check_now(self, cached_data: Dict) -> bool:
         """Determine if we should check for invalidation based on frequency rules."""
         last_check = cached_data.get('last_invalidation_check', 0)
-        content_type = self._detect_content_type(cached_data.get('metadata', {}))
-        check_frequency = self.invalidation_rules[content_type]['check_frequency']
+        check_frequency = self.invalidation_rules[self._detect_content_type(cached_data.get('metadata', {}))].check_frequency
         
         if check_frequency == 0:  # Never check
             return False
@@ -638,11 +736,8 @@ class CacheInvalidationService:
         if not cached_content:
             return True, 1.0  # No cached content, consider fully changed
         
-        # Quick check: exact match via hash
-        cached_hash = hashlib.md5(cached_content.encode()).hexdigest()
-        current_hash = hashlib.md5(current_content.encode()).hexdigest()
-        
-        if cached_hash == current_hash:
+        # Quick check: exact match (a direct compare stops at the first difference; no hashing needed)
+        if cached_content == current_content:
             return False, 0.0
         
         # Calculate similarity using multiple metrics
@@ -650,8 +745,7 @@ class CacheInvalidationService:
         change_ratio = 1 - similarity
         
         # Determine content type and threshold
-        content_type = self._detect_content_type(cached_data.get('metadata', {}))
-        threshold = self.invalidation_rules[content_type]['content_change_threshold']
+        threshold = self.invalidation_rules[self._detect_content_type(cached_data.get('metadata', {}))].content_change_threshold
         
         return change_ratio > threshold, change_ratio
     
@@ -680,16 +774,13 @@ class CacheInvalidationService:
         if not text1 or not text2:
             return 0.0
         
-        # Word-based Jaccard similarity
-        words1 = set(text1.lower().split())
-        words2 = set(text2.lower().split())
-        
-        if words1 or words2:
-            intersection = words1 & words2
-            union = words1 | words2
-            jaccard = len(intersection) / len(union) if union else 0.0
-        else:
-            jaccard = 0.0
+        # Word-based Jaccard similarity; |A ∪ B| = |A| + |B| - |A ∩ B| avoids building the union
+        words1 = _word_set(text1)
+        words2 = _word_set(text2)
+
+        shared = len(words1 & words2)
+        union = len(words1) + len(words2) - shared
+        jaccard = shared / union if union else 0.0
         
         # Length ratio
         len_ratio = min(len(text1), len(text2)) / max(len(text1), len(text2)) if max(len(text1), len(text2)) > 0 else 0
@@ -699,29 +790,8 @@ class CacheInvalidationService:
     
     def _detect_content_type(self, metadata: Dict) -> str:
         """Detect content type from metadata and URL patterns."""
-        url = metadata.get('url', '')
-        
-        # Search engines - never cache
-        search_domains = ['google.', 'bing.', 'duckduckgo.', 'yahoo.', 'baidu.']
-        if any(domain in url.lower() for domain in search_domains):
-            return 'search'
-        
-        # E-commerce/product pages
-        product_indicators = ['/product', '/item', '/p/', 'amazon.', 'ebay.', 'alibaba.', 'shopify.']
-        if any(indicator in url.lower() for indicator in product_indicators):
-            return 'product'
-        
-        # News sites (check metadata)
-        if metadata.get('pagetype') == 'article' or metadata.get('date'):
-            return 'news'
-        
-        # Forum/discussion sites
-        forum_indicators = ['forum', 'discuss', 'reddit.', 'discourse', '/t/', 'community']
-        if any(indicator in url.lower() for indicator in forum_indicators):
-            return 'forum'
-        
-        # Default to static
-        return 'static'
+        is_article = metadata.get('pagetype') == 'article' or bool(metadata.get('date'))
+        return _classify_content_type(metadata.get('url', ''), is_article)
     
     def _matches_invalidation_pattern(self, url: str) -> bool:
         """Check if URL matches known invalidation patterns."""
@@ -745,10 +815,6 @@ class CacheInvalidationService:
         
         self.invalidation_history.append(event)
         
-        # Trim history if too large
-        if len(self.invalidation_history) > self.max_history:
-            self.invalidation_history = self.invalidation_history[-self.max_history:]
-        
         logger.info(f"Cache invalidated: {reason} for {url[:50]}...")
     
     async def invalidate_pattern(self, pattern: str) -> int:
@@ -843,7 +909,7 @@ class CacheInvalidationService:
         
         return {
             'total_invalidations': len(self.invalidation_history),
-            'recent_invalidations': self.invalidation_history[-10:],
+            'recent_invalidations': list(islice(reversed(self.invalidation_history), 10))[::-1],
             'top_reasons': top_reasons,
             'top_domains': top_domains,
             'invalidation_rate': len(self.invalidation_history) / max(1, time.time() - self.invalidation_history[0]['timestamp']) if self.invalidation_history else 0
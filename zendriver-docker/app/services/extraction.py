@@ -8,6 +8,8 @@ import json
 import trafilatura
 from trafilatura import bare_extraction, baseline, extract_metadata
 from typing import Optional, Dict, Any, List
+from urllib.parse import urljoin, urlparse
+from app.core.cloudflare import cf_is_interactive_challenge_present, cf_solve_slot, verify_cf
 from app.core.exceptions import ElementNotFoundError
 from app.utils.browser_utils import safe_evaluate
 
@@ -566,13 +568,11 @@ class UnifiedExtractionService:
 
         # Check for Cloudflare before extraction
         try:
-            from app.core.cloudflare import cf_is_interactive_challenge_present
-            
             if await cf_is_interactive_challenge_present(tab, timeout=5):
                 # Try to solve it
-                from app.core.cloudflare import verify_cf
                 try:
-                    await verify_cf(tab, timeout=15)
+                    async with cf_solve_slot():
+                        await verify_cf(tab, timeout=15)
                     await asyncio.sleep(2)  # Wait for page to reload
                 except TimeoutError:
                     return {
@@ -691,13 +691,11 @@ class UnifiedExtractionService:
                                     if href_value:
                                         # Convert relative to absolute URLs
                                         if href_value.startswith('/'):
-                                            from urllib.parse import urljoin
                                             base_url = await safe_evaluate(tab, "window.location.origin")
                                             if base_url:
                                                 href_value = urljoin(base_url, href_value)
                                         elif not href_value.startswith(('http://', 'https://', 'mailto:', 'tel:')):
                                             # Relative path without leading /
-                                            from urllib.parse import urljoin
                                             current = await safe_evaluate(tab, "window.location.href")
                                             if current:
                                                 href_value = urljoin(current, href_value)
@@ -717,7 +715,6 @@ class UnifiedExtractionService:
                 # Track selector performance for optimization
                 if self.cache:
                     try:
-                        from urllib.parse import urlparse
                         domain = urlparse(current_url).netloc
                         if domain:
                             success = len(results) > 0
@@ -766,7 +763,6 @@ Elements: {len(results)}
                 # Track failed selector for optimization
                 if self.cache:
                     try:
-                        from urllib.parse import urlparse
                         domain = urlparse(current_url).netloc
                         if domain:
                             await self.cache.track_selector_performance(domain, selector, False)
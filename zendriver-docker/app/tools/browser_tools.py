@@ -8,6 +8,8 @@ import time
 import httpx
 from smolagents import Tool
 
+from app.tools.http_client import LazyHttpClientMixin
+
 # Timeout configuration - copy from original
 class TIMEOUTS:
     http_request = int(os.getenv("TIMEOUT_HTTP_REQUEST", "5"))
@@ -17,7 +19,7 @@ class TIMEOUTS:
 logger = logging.getLogger(__name__)
 
 
-class NavigateBrowserTool(Tool):
+class NavigateBrowserTool(LazyHttpClientMixin, Tool):
     name = "navigate_browser"
     description = """Navigate the browser to a specific URL. Use this for direct navigation to known URLs.
 
@@ -42,11 +44,11 @@ Returns confirmation of successful navigation."""
         },
     }
     output_type = "string"
+    client_timeout = TIMEOUTS.http_request
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_request)
 
     def forward(self, url: str, force_refresh: bool = False) -> str:
         """Navigate to URL using synchronous httpx with timeout handling"""
@@ -80,17 +82,17 @@ Returns confirmation of successful navigation."""
             raise  # Let SmolAgents handle it
 
 
-class GetCurrentURLTool(Tool):
+class GetCurrentURLTool(LazyHttpClientMixin, Tool):
     name = "get_current_url"
     description = "Get the current URL of the browser tab"
     inputs = {
     }
     output_type = "string"
+    client_timeout = TIMEOUTS.http_request
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_request)
 
     def forward(self) -> str:
         """Get current URL using synchronous httpx"""
@@ -105,7 +107,7 @@ class GetCurrentURLTool(Tool):
             return f"Error: {str(e)}"
 
 
-class ClickElementTool(Tool):
+class ClickElementTool(LazyHttpClientMixin, Tool):
     name = "click_element"
     description = """Click an element on the page using CSS selector.
 
@@ -128,11 +130,11 @@ TIPS:
         },
     }
     output_type = "string"
+    client_timeout = TIMEOUTS.http_request
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_request)
 
     def forward(self, selector: str = "body") -> str:
         """Click element using synchronous httpx"""
@@ -154,7 +156,7 @@ TIPS:
             raise  # Let SmolAgents handle the error
 
 
-class TypeTextTool(Tool):
+class TypeTextTool(LazyHttpClientMixin, Tool):
     name = "type_text"
     description = """Type text into an input field. Automatically clears existing text before typing.
 
@@ -179,11 +181,11 @@ TIPS:
         },
     }
     output_type = "string"
+    client_timeout = TIMEOUTS.http_request
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_request)
 
     def forward(self, text: str, selector: str = None) -> str:
         """Type text using synchronous httpx"""
@@ -208,7 +210,7 @@ TIPS:
             return f"Type failed: {str(e)}"
 
 
-class KeyboardNavigationTool(Tool):
+class KeyboardNavigationTool(LazyHttpClientMixin, Tool):
     """Helper for keyboard navigation. Press Enter, Tab, Escape, Arrow Keys"""
     name = "keyboard_navigate"
     description = """Press keyboard keys for navigation and form interaction.
@@ -234,11 +236,11 @@ COMMON WORKFLOWS:
         }
     }
     output_type = "string"
+    client_timeout = TIMEOUTS.http_request
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_request)
 
     def forward(self, key: str) -> str:
         """Send navigation key"""
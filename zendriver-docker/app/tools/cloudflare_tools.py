@@ -5,9 +5,10 @@ Cloudflare bypass tools - copied from openapi-server/main.py
 import os
 import logging
 import time
-import httpx
 from smolagents import Tool
 
+from app.tools.http_client import LazyHttpClientMixin
+
 # Timeout configuration - copy from original
 class TIMEOUTS:
     http_request = int(os.getenv("TIMEOUT_HTTP_REQUEST", "5"))
@@ -17,7 +18,7 @@ class TIMEOUTS:
 logger = logging.getLogger(__name__)
 
 
-class CloudflareBypassTool(Tool):
+class CloudflareBypassTool(LazyHttpClientMixin, Tool):
     """Tool to detect and bypass Cloudflare challenges"""
     name = "cloudflare_bypass"
     description = """Detect and solve Cloudflare anti-bot challenges on the current page.
@@ -61,11 +62,11 @@ Returns success status and challenge type solved."""
         },
     }
     output_type = "string"
+    client_timeout = TIMEOUTS.http_request
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_request)
 
     def forward(self, action: str = "auto", timeout: int = 15, wait_after: int = 3) -> str:
         """Detect and/or solve Cloudflare challenges"""
@@ -8,6 +8,8 @@ import httpx
 from typing import List
 from smolagents import Tool
 
+from app.tools.http_client import LazyHttpClientMixin
+
 # Timeout configuration - copy from original
 class TIMEOUTS:
     http_request = int(os.getenv("TIMEOUT_HTTP_REQUEST", "5"))
@@ -17,7 +19,7 @@ class TIMEOUTS:
 logger = logging.getLogger(__name__)
 
 
-class ExtractContentTool(Tool):
+class ExtractContentTool(LazyHttpClientMixin, Tool):
     name = "extract_content"
     description = """Extract content from the CURRENT ACTIVE TAB (tab 0). Returns text and links.
 
@@ -50,11 +52,11 @@ Links are automatically extracted (hrefs included in results)."""
         },
     }
     output_type = "string"
+    client_timeout = TIMEOUTS.http_extraction
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_extraction)
 
     def forward(self, selector: str = None) -> str:
         """Extract content with timeout handling"""
@@ -102,7 +104,7 @@ Links are automatically extracted (hrefs included in results)."""
             raise  # Let SmolAgents handle it
 
 
-class ParallelExtractionTool(Tool):
+class ParallelExtractionTool(LazyHttpClientMixin, Tool):
     name = "extract_multiple"
     description = """Extract content from multiple CSS selectors in parallel for faster data gathering.
 
@@ -117,11 +119,11 @@ Returns aggregated results with cache statistics."""
         "selectors": {"type": "array", "description": "List of CSS selectors to extract from simultaneously"}
     }
     output_type = "string"
+    client_timeout = TIMEOUTS.http_extraction
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_extraction)
 
     def forward(self, selectors: List[str]) -> str:
         """Extract from multiple selectors in parallel"""
@@ -159,7 +161,7 @@ Returns aggregated results with cache statistics."""
             return f"Parallel extraction failed: {str(e)}"
 
 
-class CapturePageMarkdownTool(Tool):
+class CapturePageMarkdownTool(LazyHttpClientMixin, Tool):
     name = "capture_page_markdown"
     description = """Capture the current page content as a markdown file for long-term storage.
 
@@ -185,11 +187,11 @@ Returns filename and file size, not the content itself."""
         }
     }
     output_type = "string"
+    client_timeout = TIMEOUTS.http_extraction
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_extraction)
 
     def forward(self, include_metadata: bool = True) -> str:
         """Capture current page as markdown"""
@@ -0,0 +1,23 @@
+"""
+Lazily opened HTTP client shared by the zendriver API tools
+"""
+
+import threading
+import httpx
+
+# Serializes lazy client creation: pooled agents on different threads share the tool instances
+_CLIENT_SETUP_LOCK = threading.Lock()
+
+
+class LazyHttpClientMixin:
+    """Opens self.client in smolagents' setup() hook, so only tools that get called pay for one"""
+
+    # Seconds; subclasses set their own
+    client_timeout: float = 5
+
+    def setup(self):
+        """Open the HTTP client on the first tool call"""
+        with _CLIENT_SETUP_LOCK:
+            if not self.is_initialized:
+                self.client = httpx.Client(timeout=self.client_timeout)
+                self.is_initialized = True
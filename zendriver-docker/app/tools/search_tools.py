@@ -5,12 +5,13 @@ Search and web navigation tools - copied from openapi-server/main.py
 import os
 import logging
 import time
-import httpx
 import re
 from typing import Optional
 from smolagents import Tool
 from urllib.parse import urlparse
 
+from app.tools.http_client import LazyHttpClientMixin
+
 # Timeout configuration - copy from original
 class TIMEOUTS:
     http_request = int(os.getenv("TIMEOUT_HTTP_REQUEST", "5"))
@@ -20,7 +21,7 @@ class TIMEOUTS:
 logger = logging.getLogger(__name__)
 
 
-class WebSearchTool(Tool):
+class WebSearchTool(LazyHttpClientMixin, Tool):
     name = "web_search"
     description = """Search the web using search engines (DuckDuckGo, Google, etc). Returns dict with results array.
 
@@ -76,11 +77,11 @@ RETURNS: Dict with 'query', 'engine', 'results' array (title, url, domain), 'sea
         }
     }
     output_type = "string"  # JSON string containing search results
+    client_timeout = TIMEOUTS.http_extraction
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_extraction)
 
         # Load search configuration from environment
         self.max_results_default = int(os.getenv("SEARCH_MAX_RESULTS_DEFAULT", "10"))
@@ -357,16 +358,16 @@ RETURNS: Dict with 'query', 'engine', 'results' array (title, url, domain), 'sea
             return f"Search failed: {str(e)}"
 
 
-class SearchHistoryTool(Tool):
+class SearchHistoryTool(LazyHttpClientMixin, Tool):
     name = "search_history"
     description = "Get search history from cache"
     inputs = {}
     output_type = "string"
+    client_timeout = TIMEOUTS.http_request
 
     def __init__(self, duckdb_url: str):
         super().__init__()
         self.duckdb_url = duckdb_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_request)
 
     def forward(self) -> str:
         """Get cached search history using synchronous httpx"""
@@ -380,7 +381,7 @@ class SearchHistoryTool(Tool):
             return f"Failed to get history: {str(e)}"
 
 
-class VisitWebpageTool(Tool):
+class VisitWebpageTool(LazyHttpClientMixin, Tool):
     name = "visit_webpage"
     description = """Navigate to a URL and automatically extract its content. Combines navigation + extraction in one step.
 
@@ -414,11 +415,11 @@ ALTERNATIVE: Use navigate_browser + extract_content separately for more control"
         "extract_text": {"type": "boolean", "description": "Extract text content", "default": True, "nullable": True}
     }
     output_type = "string"
+    client_timeout = TIMEOUTS.page_load
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.page_load)
 
     def forward(self, url: str, wait_for: str = None, extract_text: bool = True) -> str:
         """Visit webpage and extract content"""
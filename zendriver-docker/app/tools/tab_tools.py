@@ -9,8 +9,10 @@ import httpx
 from typing import Dict, Any
 from smolagents import Tool
 
+from app.tools.http_client import LazyHttpClientMixin
 
-class OpenBackgroundTabTool(Tool):
+
+class OpenBackgroundTabTool(LazyHttpClientMixin, Tool):
     name = "open_background_tab"
     description = """Open valuable pages in background tabs for user exploration (OPTIONAL - only when truly helpful).
 
@@ -41,6 +43,7 @@ Note: Background tabs are for user exploration - only tab 0 is operable for auto
         "url": {"type": "string", "description": "URL to open in background tab"}
     }
     output_type = "any"
+    client_timeout = 30.0
 
     def __init__(self, api_url: str = "http://localhost:8080"):
         super().__init__()
@@ -51,15 +54,14 @@ Note: Background tabs are for user exploration - only tab 0 is operable for auto
         endpoint = f"{self.api_url}/tabs/open_background"
 
         try:
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(endpoint, json={"url": url})
-                response.raise_for_status()
-                return response.json()
+            response = self.client.post(endpoint, json={"url": url})
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPError as e:
             return {"error": f"Failed to open background tab: {str(e)}", "url": url}
 
 
-class ListTabsTool(Tool):
+class ListTabsTool(LazyHttpClientMixin, Tool):
     name = "list_tabs"
     description = """List all open browser tabs with their URLs and indices.
 
@@ -81,6 +83,7 @@ class ListTabsTool(Tool):
 
     inputs = {}
     output_type = "any"
+    client_timeout = 10.0
 
     def __init__(self, api_url: str = "http://localhost:8080"):
         super().__init__()
@@ -91,15 +94,14 @@ class ListTabsTool(Tool):
         endpoint = f"{self.api_url}/tabs/list"
 
         try:
-            with httpx.Client(timeout=10.0) as client:
-                response = client.get(endpoint)
-                response.raise_for_status()
-                return response.json()
+            response = self.client.get(endpoint)
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPError as e:
             return {"error": f"Failed to list tabs: {str(e)}", "tabs": []}
 
 
-class CloseTabTool(Tool):
+class CloseTabTool(LazyHttpClientMixin, Tool):
     name = "close_tab"
     description = """Close a background tab by its index.
 
@@ -130,6 +132,7 @@ class CloseTabTool(Tool):
         "tab_index": {"type": "integer", "description": "Index of tab to close (must be >= 1, cannot be 0)"}
     }
     output_type = "any"
+    client_timeout = 10.0
 
     def __init__(self, api_url: str = "http://localhost:8080"):
         super().__init__()
@@ -147,10 +150,9 @@ class CloseTabTool(Tool):
         endpoint = f"{self.api_url}/tabs/close"
 
         try:
-            with httpx.Client(timeout=10.0) as client:
-                response = client.post(endpoint, json={"tab_index": tab_index})
-                response.raise_for_status()
-                return response.json()
+            response = self.client.post(endpoint, json={"tab_index": tab_index})
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 400:
                 return {"error": e.response.json().get("detail", str(e)), "status": "error"}
@@ -4,10 +4,11 @@ Utility tools - copied from openapi-server/main.py
 
 import os
 import logging
-import httpx
 from typing import List
 from smolagents import Tool
 
+from app.tools.http_client import LazyHttpClientMixin
+
 # Timeout configuration - copy from original
 class TIMEOUTS:
     http_request = int(os.getenv("TIMEOUT_HTTP_REQUEST", "5"))
@@ -17,7 +18,7 @@ class TIMEOUTS:
 logger = logging.getLogger(__name__)
 
 
-class ScreenshotTool(Tool):
+class ScreenshotTool(LazyHttpClientMixin, Tool):
     name = "take_screenshot"
     description = """Take a screenshot of the current page or specific element. Saves to /tmp/exports/.
 
@@ -36,11 +37,11 @@ Returns path to saved screenshot file."""
         "full_page": {"type": "boolean", "description": "Capture full page", "default": False, "nullable": True}
     }
     output_type = "string"
+    client_timeout = TIMEOUTS.http_request
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_request)
 
     def forward(self, selector: str = None, full_page: bool = False) -> str:
         """Take screenshot and save to folder"""
@@ -57,18 +58,18 @@ Returns path to saved screenshot file."""
             return f"Screenshot failed: {str(e)}"
 
 
-class GetElementPositionTool(Tool):
+class GetElementPositionTool(LazyHttpClientMixin, Tool):
     name = "get_element_position"
     description = "Get the position and size of an element"
     inputs = {
         "selector": {"type": "string", "description": "CSS selector"},
     }
     output_type = "string"
+    client_timeout = TIMEOUTS.http_request
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=TIMEOUTS.http_request)
 
     def forward(self, selector: str) -> str:
         """Get element position"""
@@ -85,7 +86,7 @@ class GetElementPositionTool(Tool):
             return f"Position error: {str(e)}"
 
 
-class CaptureAPIResponseTool(Tool):
+class CaptureAPIResponseTool(LazyHttpClientMixin, Tool):
     name = "capture_api_response"
     description = """Capture API/AJAX response data during navigation or interaction.
 
@@ -169,11 +170,11 @@ Why use this instead of extract_content?
         }
     }
     output_type = "any"
+    client_timeout = 30  # Longer timeout for API capture
 
     def __init__(self, api_url: str):
         super().__init__()
         self.api_url = api_url
-        self.client = httpx.Client(timeout=30)  # Longer timeout for API capture
 
     def forward(self, action: str, url: str = None, selector: str = None,
                 api_pattern: str = None, timeout: int = 5):
@@ -1,20 +1,22 @@
 """Browser utility functions for zendriver operations."""
 
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-async def safe_evaluate(tab, expression: str):
+async def safe_evaluate(tab, expression: str, await_promise: bool = False):
     """
     Safe wrapper for tab.evaluate that properly handles zendriver's return behavior.
     
     Zendriver's evaluate() returns (remote_object, errors) tuple when remote_object.value 
     is falsy, even with return_by_value=True. This wrapper ensures we always get the 
-    actual JavaScript return value.
+    actual JavaScript return value. Pass await_promise=True to resolve a returned
+    Promise before the value comes back.
     """
     try:
-        result = await tab.evaluate(expression, return_by_value=True)
+        result = await tab.evaluate(expression, await_promise=await_promise, return_by_value=True)
         
         # Handle all tuple cases
         if isinstance(result, tuple):
@@ -39,4 +41,72 @@ async def safe_evaluate(tab, expression: str):
         
     except Exception as e:
         logger.error(f"Safe evaluate error for expression: {expression[:100]}... - Error: {e}")
-        return None
\ No newline at end of file
+        return None
+
+# Evaluates waiting to be coalesced, keyed by id(tab); cleared on every flush
+_pending_evaluates: dict[int, list] = {}
+
+# Batch tasks in flight; the loop only holds weak references, so keep them alive here
+_evaluate_batch_tasks: set = set()
+
+
+async def batched_evaluate(tab, expression: str, window: float = 0.001):
+    """
+    Evaluate an expression, coalescing with other calls for the same tab.
+
+    Expressions issued for one tab within `window` seconds are sent as a single
+    Runtime.evaluate returning an array, then fanned back out to each caller.
+    Each expression is isolated in its own try/catch, so one failing does not
+    affect the others. Returns the same values safe_evaluate would (None on error).
+    Callers only benefit when they issue evaluates concurrently (asyncio.gather).
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    batch = _pending_evaluates.get(id(tab))
+    if batch is None:
+        batch = _pending_evaluates[id(tab)] = []
+        loop.call_later(window, _flush_evaluates, tab)
+    batch.append((expression, future))
+
+    return await future
+
+
+def _flush_evaluates(tab):
+    """Hand the tab's pending batch to a task (call_later callbacks can't await)"""
+    batch = _pending_evaluates.pop(id(tab), None)
+    if batch:
+        task = asyncio.ensure_future(_run_evaluate_batch(tab, batch))
+        _evaluate_batch_tasks.add(task)
+        task.add_done_callback(_evaluate_batch_tasks.discard)
+
+
+async def _run_evaluate_batch(tab, batch: list):
+    """Send one Runtime.evaluate for the whole batch and resolve each future"""
+    try:
+        if len(batch) == 1:
+            expression, future = batch[0]
+            results = [{"ok": True, "value": await safe_evaluate(tab, expression)}]
+        else:
+            script = "[" + ",".join(
+                f"(() => {{ try {{ return {{ok: true, value: ({expression})}}; }} "
+                f"catch (e) {{ return {{ok: false, error: String(e)}}; }} }})()"
+                for expression, _ in batch
+            ) + "]"
+            results = await safe_evaluate(tab, script)
+            if not isinstance(results, list) or len(results) != len(batch):
+                logger.error(f"Batched evaluate returned unexpected result for {len(batch)} expressions")
+                results = [None] * len(batch)
+    except Exception as e:
+        logger.error(f"Batched evaluate error: {e}")
+        results = [None] * len(batch)
+
+    for (expression, future), item in zip(batch, results):
+        if future.done():
+            continue
+        if isinstance(item, dict) and item.get("ok"):
+            future.set_result(item.get("value"))
+        else:
+            if isinstance(item, dict):
+                logger.error(f"JavaScript evaluation error in batch: {item.get('error')} ({expression[:100]})")
+            future.set_result(None)
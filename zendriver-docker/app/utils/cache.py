@@ -4,12 +4,58 @@ import hashlib
 import pickle
 import asyncio
 import logging
+import math
+import orjson
 from typing import Optional, Any, Dict
 from functools import wraps
 from app.utils.memory_manager import BoundedLRUCache
 
 logger = logging.getLogger(__name__)
 
+# Exact scalar types orjson writes and reads back unchanged (floats must also be finite)
+_JSON_SCALARS = frozenset({str, int, bool, type(None)})
+
+
+def _is_plain_json(value: Any) -> bool:
+    """True when value is built only from dicts with str keys, lists, finite floats and JSON scalars.
+
+    orjson would turn tuples into lists, NaN/Inf into null and subclasses into their base
+    type, so anything else has to go through pickle to come back unchanged.
+    """
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        kind = type(item)
+        if kind is dict:
+            if any(type(k) is not str for k in item):
+                return False
+            stack.extend(item.values())
+        elif kind is list:
+            stack.extend(item)
+        elif kind is float:
+            if not math.isfinite(item):
+                return False
+        elif kind not in _JSON_SCALARS:
+            return False
+    return True
+
+
+def _encode(value: Any) -> bytes:
+    """Serialize a cache value for Redis: orjson when it round-trips exactly, pickle otherwise"""
+    if _is_plain_json(value):
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            pass  # Integers beyond 64 bits
+    return pickle.dumps(value, protocol=5)
+
+
+def _decode(raw: bytes) -> Any:
+    """Inverse of _encode; pickle streams always start with the PROTO opcode (0x80), JSON never does"""
+    if raw[:1] == b'\x80':
+        return pickle.loads(raw)
+    return orjson.loads(raw)
+
 class CacheManager:
     """Cache manager with memory limits"""
 
@@ -51,7 +97,7 @@ class CacheManager:
             try:
                 value = await self.redis_client.get(key)
                 if value:
-                    return pickle.loads(value)
+                    return _decode(value)
             except:
                 pass
 
@@ -63,12 +109,32 @@ class CacheManager:
 
         if self.redis_client:
             try:
-                await self.redis_client.setex(key, ttl, pickle.dumps(value))
+                await self.redis_client.setex(key, ttl, _encode(value))
             except:
                 pass
 
         await self.memory_cache.set(key, value, ttl)
     
+    async def incr(self, key: str, ttl: Optional[int] = None) -> int:
+        """Increment an integer counter and re-arm its TTL, atomically in Redis"""
+        ttl = ttl or self.settings.cache_ttl
+
+        if self.redis_client:
+            try:
+                # INCR + EXPIRE in one round-trip; concurrent increments never overwrite each other
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.incr(key)
+                pipe.expire(key, ttl)
+                count, _ = await pipe.execute()
+                await self.memory_cache.set(key, count, ttl)
+                return count
+            except:
+                pass  # e.g. a counter still stored as pickle; rewritten below
+
+        count = (await self.get(key) or 0) + 1
+        await self.set(key, count, ttl)
+        return count
+
     async def delete(self, key: str):
         """Delete from cache"""
         if self.redis_client:
@@ -102,7 +168,7 @@ class CacheManager:
             if pattern.replace('*', '') in k
         ]
         for key in keys_to_delete:
-            await self.memory_cache.set(key, None, 0)
+            del self.memory_cache[key]
 
     async def _periodic_cleanup(self):
         """Clean up expired entries every 30 minutes with proper error handling"""
@@ -3,6 +3,7 @@ HTTP client for DuckDB cache service
 """
 
 import httpx
+import orjson
 import hashlib
 import logging
 from typing import Optional, Dict, List, Any
@@ -16,7 +17,13 @@ class DuckDBClient:
 
     def __init__(self, duckdb_url: str):
         self.duckdb_url = duckdb_url.rstrip('/')
-        self.client = httpx.Client(timeout=10.0)
+        # One keep-alive pool shared by the worker threads that call this client;
+        # a dead cache host fails fast on connect instead of stalling the L2 lookup
+        self.client = httpx.Client(
+            base_url=self.duckdb_url,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0),
+            timeout=httpx.Timeout(10.0, connect=2.0)
+        )
         logger.info(f"DuckDB client initialized: {self.duckdb_url}")
 
     def close(self):
@@ -34,9 +41,9 @@ class DuckDBClient:
             None if not found or expired
         """
         try:
-            response = self.client.get(f"{self.duckdb_url}/cache/page/{cache_key}")
+            response = self.client.get(f"/cache/page/{cache_key}")
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 logger.debug(f"L2 cache hit: {cache_key}")
                 return {
                     'data': {
@@ -120,7 +127,7 @@ class DuckDBClient:
             }
 
             response = self.client.post(
-                f"{self.duckdb_url}/cache/page",
+                "/cache/page",
                 json=payload
             )
 
@@ -160,7 +167,7 @@ class DuckDBClient:
             }
 
             response = self.client.post(
-                f"{self.duckdb_url}/cache/element",
+                "/cache/element",
                 json=payload
             )
 
@@ -187,11 +194,11 @@ class DuckDBClient:
         """
         try:
             response = self.client.get(
-                f"{self.duckdb_url}/cache/element/{domain}/{element_type}"
+                f"/cache/element/{domain}/{element_type}"
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 return data.get('selectors', [])
             elif response.status_code == 404:
                 return []
@@ -213,10 +220,10 @@ class DuckDBClient:
             Dict with page_count, total_size_mb, oldest_entry_days, etc.
         """
         try:
-            response = self.client.get(f"{self.duckdb_url}/cache/stats")
+            response = self.client.get("/cache/stats")
 
             if response.status_code == 200:
-                stats = response.json()
+                stats = orjson.loads(response.content)
 
                 # Calculate oldest entry age
                 oldest_entry = stats.get('oldest_entry')
@@ -263,10 +270,10 @@ class DuckDBClient:
             Dict with counts of deleted pages and selectors
         """
         try:
-            response = self.client.delete(f"{self.duckdb_url}/cache/expired")
+            response = self.client.delete("/cache/expired")
 
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
                 logger.warning(f"DuckDB cleanup failed: {response.status_code}")
                 return {'pages_deleted': 0, 'selectors_deleted': 0}
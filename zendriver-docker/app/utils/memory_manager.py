@@ -14,15 +14,35 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 class BoundedLRUCache:
-    """Thread-safe LRU cache with memory limits"""
+    """Thread-safe LRU cache with memory limits and per-entry TTL"""
 
     def __init__(self, max_items: int = 10000, max_memory_mb: int = 500):
+        # key -> (value, expires_at, size_bytes); size is kept so eviction never re-measures
         self.cache = OrderedDict()
         self.max_items = max_items
         self.max_memory_bytes = max_memory_mb * 1024 * 1024
         self.current_size_bytes = 0
         self._lock = asyncio.Lock()
 
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.cache
+
+    def __delitem__(self, key: str) -> None:
+        self._discard(key)
+
+    def keys(self):
+        """Cached keys, least recently used first"""
+        return self.cache.keys()
+
+    def _discard(self, key: str) -> None:
+        """Drop an entry and release its bytes from the budget"""
+        entry = self.cache.pop(key, None)
+        if entry is not None:
+            self.current_size_bytes -= entry[2]
+
     def _get_size(self, obj: Any) -> int:
         """Estimate memory size of object"""
         try:
@@ -36,13 +56,18 @@ class BoundedLRUCache:
                 return 256
 
     async def get(self, key: str) -> Optional[Any]:
-        """Get item and move to end (most recently used)"""
+        """Get item and move to end (most recently used); expired items are dropped"""
         async with self._lock:
-            if key not in self.cache:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at, _ = entry
+            if expires_at <= time.time():
+                self._discard(key)
                 return None
 
             self.cache.move_to_end(key)
-            value, timestamp = self.cache[key]
             return value
 
     async def set(self, key: str, value: Any, ttl: int = 3600):
@@ -50,16 +75,19 @@ class BoundedLRUCache:
         async with self._lock:
             size = self._get_size(value)
 
+            # Replacing a key must not count its old value against the budget
+            self._discard(key)
+
             while (len(self.cache) >= self.max_items or
                    self.current_size_bytes + size > self.max_memory_bytes):
                 if not self.cache:
                     break
 
-                oldest_key, (oldest_val, _) = self.cache.popitem(last=False)
-                self.current_size_bytes -= self._get_size(oldest_val)
+                oldest_key, (_, _, oldest_size) = self.cache.popitem(last=False)
+                self.current_size_bytes -= oldest_size
                 logger.debug(f"Evicted cache key: {oldest_key}")
 
-            self.cache[key] = (value, time.time())
+            self.cache[key] = (value, time.time() + ttl, size)
             self.current_size_bytes += size
 
             if self.current_size_bytes > self.max_memory_bytes * 0.8:
@@ -69,15 +97,13 @@ class BoundedLRUCache:
         """Remove expired entries"""
         async with self._lock:
             now = time.time()
-            expired_keys = []
-
-            for key, (value, timestamp) in self.cache.items():
-                if now - timestamp > 3600:
-                    expired_keys.append(key)
+            expired_keys = [
+                key for key, (_, expires_at, _) in self.cache.items()
+                if expires_at <= now
+            ]
 
             for key in expired_keys:
-                value, _ = self.cache.pop(key)
-                self.current_size_bytes -= self._get_size(value)
+                self._discard(key)
 
     def get_stats(self) -> dict:
         """Get cache statistics"""
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 CSS_SELECTOR_PATTERN = re.compile(
     r'^[a-zA-Z0-9\s\-_\.#\[\]=\'"~\*\^\$\|:,>+()]+$'
@@ -9,15 +10,18 @@ FORBIDDEN_PATTERNS = [
     r'onload\s*=', r'<iframe', r'data:', r'vbscript:'
 ]
 
+# All forbidden patterns as one case-insensitive alternation
+FORBIDDEN_PATTERN = re.compile('|'.join(FORBIDDEN_PATTERNS), re.IGNORECASE)
+
+@lru_cache(maxsize=4096)
 def validate_css_selector(selector: str) -> bool:
-    """Validate CSS selector for safety and format"""
+    """Validate CSS selector for safety and format (memoized; selectors recur constantly)"""
     if not selector or len(selector) > 500:
         return False
 
     # Check against forbidden patterns
-    for pattern in FORBIDDEN_PATTERNS:
-        if re.search(pattern, selector, re.IGNORECASE):
-            return False
+    if FORBIDDEN_PATTERN.search(selector):
+        return False
 
     # CSS selector validation
-    return bool(CSS_SELECTOR_PATTERN.match(selector))
\ No newline at end of file
+    return bool(CSS_SELECTOR_PATTERN.match(selector))
@@ -0,0 +1,47 @@
+"""Agent pool reuse"""
+
+import pytest
+
+pytest.importorskip("smolagents")
+pytest.importorskip("openai")
+
+from smolagents.local_python_executor import InterpreterError
+from smolagents.models import Model
+
+from app.services.agent_manager import _reset_agent_state
+from app.services.safe_code_agent import SafeCodeAgent
+
+
+@pytest.fixture
+def agent():
+    agent = SafeCodeAgent(tools=[], model=Model())
+    agent.python_executor.send_variables(variables=agent.state)
+    agent.python_executor.send_tools({**agent.tools, **agent.managed_agents})
+    return agent
+
+
+def test_variables_do_not_survive_checkout(agent):
+    agent.python_executor("leaked = 'first user'")
+    agent.state["leaked_arg"] = "first user"
+
+    _reset_agent_state(agent)
+
+    assert "leaked" not in agent.python_executor.state
+    assert "leaked_arg" not in agent.state
+    with pytest.raises(InterpreterError, match="`leaked` is not defined"):
+        agent.python_executor("leaked")
+
+
+def test_functions_do_not_survive_checkout(agent):
+    agent.python_executor("def helper():\n    return 'first user'")
+
+    _reset_agent_state(agent)
+
+    with pytest.raises(InterpreterError, match="'helper' is not among the explicitly allowed tools"):
+        agent.python_executor("helper()")
+
+
+def test_executor_still_usable_after_reset(agent):
+    _reset_agent_state(agent)
+
+    assert agent.python_executor("result = 1 + 1\nresult").output == 2
@@ -0,0 +1,59 @@
+"""Redis value encoding round-trips"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("orjson")
+
+from app.utils.cache import _decode, _encode
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+class Label(str):
+    pass
+
+
+@pytest.mark.parametrize("value", [
+    {"title": "page", "links": ["a", "b"], "count": 3, "score": 0.5, "ok": True, "none": None},
+    [1, "two", [3.0, {"four": 4}]],
+    "plain",
+    2 ** 70,
+    ("tuple", 1),
+    {"nested": ("tuple", [1, 2])},
+    {1: "int key"},
+    datetime(2024, 1, 2, 3, 4, 5),
+    Point(1, 2),
+    Label("subclass"),
+])
+def test_round_trip_preserves_value_and_type(value):
+    decoded = _decode(_encode(value))
+
+    assert decoded == value
+    assert type(decoded) is type(value)
+
+
+def test_nested_tuple_stays_a_tuple():
+    decoded = _decode(_encode({"pair": (1, 2)}))
+
+    assert decoded["pair"] == (1, 2)
+    assert type(decoded["pair"]) is tuple
+
+
+def test_non_finite_floats_survive():
+    decoded = _decode(_encode({"nan": float("nan"), "inf": float("inf"), "ninf": float("-inf")}))
+
+    assert math.isnan(decoded["nan"])
+    assert decoded["inf"] == float("inf")
+    assert decoded["ninf"] == float("-inf")
+
+
+def test_plain_json_is_stored_as_json():
+    assert _encode({"a": [1, 2.5, "x", None]}).startswith(b"{")
@@ -0,0 +1,25 @@
+"""Interaction request model validation"""
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("zendriver")
+
+from pydantic import ValidationError
+
+from app.api.routes.interaction import TabNavigationRequest, TypeRequest
+
+
+def test_null_fields_fall_back_to_defaults():
+    request = TypeRequest(text="hello", clear_first=None, press_enter=None, delay=None, wait_for=None)
+
+    assert request.clear_first is False
+    assert request.press_enter is False
+    assert request.delay == 0.045
+    assert request.wait_for == "network_idle"
+    assert TabNavigationRequest(count=None, shift=None) == TabNavigationRequest()
+
+
+def test_null_required_field_is_rejected():
+    with pytest.raises(ValidationError, match="text"):
+        TypeRequest(text=None)
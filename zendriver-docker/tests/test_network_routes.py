@@ -0,0 +1,45 @@
+"""Network capture route helpers"""
+
+import asyncio
+import gc
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("zendriver")
+
+from app.api.routes import network
+
+
+class UnhashableTab:
+    """Mirrors zendriver's Tab: __eq__ without __hash__ makes instances unhashable"""
+
+    def __init__(self):
+        self.sent = []
+
+    def __eq__(self, other):
+        return self is other
+
+    async def send(self, command):
+        self.sent.append(command)
+
+
+def test_network_enabled_once_per_tab():
+    tab = UnhashableTab()
+
+    asyncio.run(network._ensure_network_enabled(tab))
+    asyncio.run(network._ensure_network_enabled(tab))
+
+    assert len(tab.sent) == 1
+
+
+def test_network_enabled_entry_dropped_with_tab():
+    tab = UnhashableTab()
+    tab_id = id(tab)
+    asyncio.run(network._ensure_network_enabled(tab))
+    assert tab_id in network._network_enabled_tabs
+
+    del tab
+    gc.collect()
+
+    assert tab_id not in network._network_enabled_tabs